@@ -3,11 +3,22 @@
 A Model Context Protocol (MCP) server that connects to the Strava API.
 """
 
-from typing import Literal, Optional, Any
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Literal, Optional, Any, AsyncIterator, Union
 import json
+import orjson
+import pydantic_core
 from fastmcp import FastMCP
 
 from strava_mcp.auth import get_client
+from strava_mcp.http import on_shutdown
+from strava_mcp.models import (
+    ActivityDetails,
+    ActivityError,
+    ActivitySummary,
+    LapSummary,
+)
 from strava_mcp.services.athlete import get_athlete_stats
 from strava_mcp.services.activities import (
     list_activities,
@@ -15,28 +26,59 @@ from strava_mcp.services.activities import (
     get_activity_details,
 )
 from strava_mcp.services.streams import get_activity_laps, get_activity_streams
-from strava_mcp.services.analysis import analyze_data
+from strava_mcp.services.analysis import (
+    analyze_data,
+    get_analysis_executor,
+    shutdown_analysis_executor,
+)
 
 # Constants
 MAX_LIMIT = 200
 
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Close the shared HTTP connection pool and analysis workers on shutdown."""
+    try:
+        yield
+    finally:
+        shutdown_analysis_executor()
+        await on_shutdown()
+
+
+def serialize_tool_result(result: Any) -> str:
+    """
+    Serialize tool results with orjson, which encodes large numeric arrays fastest.
+    Model dataclasses are encoded natively, without building dicts first.
+    Anything orjson rejects (sets, bytes, integers beyond 64 bits) goes through
+    pydantic_core, FastMCP's default serializer, so the output stays the same.
+    """
+    try:
+        return orjson.dumps(result).decode()
+    except orjson.JSONEncodeError:
+        return pydantic_core.to_json(result, fallback=str).decode()
+
+
 # Initialize FastMCP
-mcp = FastMCP("strava-server")
+mcp = FastMCP("strava-server", lifespan=lifespan, tool_serializer=serialize_tool_result)
 
 
 @mcp.tool()
-def get_athlete_stats_tool() -> str:
+async def get_athlete_stats_tool(force_refresh: bool = False) -> str:
     """
     Get statistics for the authenticated athlete.
     Returns a formatted string with recent and all-time stats.
+
+    Args:
+        force_refresh: If True, bypass the cached profile (5 min) and stats (30 s)
     """
     client = get_client()
-    stats = get_athlete_stats(client)
+    stats = await get_athlete_stats(client, force_refresh=force_refresh)
     return stats.to_formatted_string()
 
 
 @mcp.tool()
-def list_activities_tool(limit: int = 5) -> list[dict]:
+async def list_activities_tool(limit: int = 5) -> list[ActivitySummary]:
     """
     List recent activities for the authenticated athlete.
 
@@ -47,12 +89,11 @@ def list_activities_tool(limit: int = 5) -> list[dict]:
         limit = MAX_LIMIT
 
     client = get_client()
-    activities = list_activities(client, limit)
-    return [activity.to_dict() for activity in activities]
+    return await list_activities(client, limit)
 
 
 @mcp.tool()
-def search_activities_tool(
+async def search_activities_tool(
     query: Optional[str] = None,
     activity_type: Optional[str] = None,
     after: Optional[str] = None,
@@ -60,10 +101,11 @@ def search_activities_tool(
     min_distance: Optional[float] = None,
     max_distance: Optional[float] = None,
     limit: int = 50,
-) -> list[dict]:
+) -> list[ActivitySummary]:
     """
     Search activities with optional filters.
-    Note: Name/description search is client-side, so a reasonable limit is recommended.
+    Note: Date filters are applied by Strava; name, type and distance filters are
+    client-side and scan up to 1000 recent activities in the date range by default.
 
     Args:
         query: Search term to match in activity name (case-insensitive, partial match)
@@ -72,13 +114,13 @@ def search_activities_tool(
         before: ISO 8601 date string (e.g., "2026-01-01") - activities before this date
         min_distance: Minimum distance in meters
         max_distance: Maximum distance in meters
-        limit: Maximum number of activities to fetch from API (default 50)
+        limit: Maximum number of matching activities to return (default 50)
     """
     if limit > MAX_LIMIT:
         limit = MAX_LIMIT
 
     client = get_client()
-    activities = search_activities(
+    return await search_activities(
         client,
         query=query,
         activity_type=activity_type,
@@ -88,11 +130,10 @@ def search_activities_tool(
         max_distance=max_distance,
         limit=limit,
     )
-    return [activity.to_dict() for activity in activities]
 
 
 @mcp.tool()
-def get_activity_details_tool(activity_id: int) -> dict:
+async def get_activity_details_tool(activity_id: int) -> ActivityDetails:
     """
     Get detailed information for a specific activity.
 
@@ -100,12 +141,45 @@ def get_activity_details_tool(activity_id: int) -> dict:
         activity_id: The ID of the activity to retrieve
     """
     client = get_client()
-    details = get_activity_details(client, activity_id)
-    return details.to_dict()
+    return await get_activity_details(client, activity_id)
+
+
+@mcp.tool()
+async def get_activities_details_tool(
+    activity_ids: list[int],
+) -> list[Union[ActivityDetails, ActivityError]]:
+    """
+    Get detailed information for several activities at once.
+    Prefer this over repeated get_activity_details_tool calls, e.g. to compare activities.
+    Activities that can't be retrieved (e.g. private or deleted) are returned as
+    {"id", "error"} entries in their place.
+
+    Args:
+        activity_ids: The IDs of the activities to retrieve (up to 200)
+    """
+    if len(activity_ids) > MAX_LIMIT:
+        raise ValueError(f"At most {MAX_LIMIT} activity IDs can be requested at once.")
+
+    client = get_client()
+    # Requests run concurrently, bounded by the client's in-flight limit
+    details = await asyncio.gather(
+        *(get_activity_details(client, activity_id) for activity_id in activity_ids),
+        return_exceptions=True,
+    )
+    results: list[Union[ActivityDetails, ActivityError]] = []
+    for activity_id, detail in zip(activity_ids, details):
+        if isinstance(detail, RuntimeError):
+            # One missing activity shouldn't discard the rest of the batch
+            results.append(ActivityError(id=activity_id, error=str(detail)))
+        elif isinstance(detail, BaseException):
+            raise detail
+        else:
+            results.append(detail)
+    return results
 
 
 @mcp.tool()
-def get_activity_laps_tool(activity_id: int) -> list[dict]:
+async def get_activity_laps_tool(activity_id: int) -> list[LapSummary]:
     """
     Get lap breakdowns for a specific activity.
 
@@ -113,15 +187,15 @@ def get_activity_laps_tool(activity_id: int) -> list[dict]:
         activity_id: The ID of the activity to retrieve laps for
     """
     client = get_client()
-    laps = get_activity_laps(client, activity_id)
-    return [lap.to_dict() for lap in laps]
+    return await get_activity_laps(client, activity_id)
 
 
 @mcp.tool()
-def get_activity_streams_tool(
+async def get_activity_streams_tool(
     activity_id: int,
     types: Optional[list[str]] = None,
     resolution: Optional[Literal["low", "medium", "high"]] = None,
+    compact: bool = False,
 ) -> dict:
     """
     Get raw stream data (GPS, HR, power, etc.) for a specific activity.
@@ -130,17 +204,22 @@ def get_activity_streams_tool(
         activity_id: The ID of the activity to retrieve streams for
         types: List of stream types to fetch. Options: time, latlng, distance, altitude,
                velocity_smooth, heartrate, cadence, watts, temp, moving, grade_smooth.
-               If None, all available streams will be returned.
+               If None, all available streams will be returned; otherwise only the
+               requested ones are.
         resolution: Data point resolution - 'low' (100 points), 'medium' (1000 points),
                    'high' (10000 points), or None (all points)
+        compact: If True, each stream is returned as {"dtype", "scale", "data"} with
+                 base64 little-endian samples quantized to their natural precision
+                 (e.g. heartrate as uint8, latlng as int32 * 1e7), to shrink large
+                 payloads. Decode with np.frombuffer(b64decode(data), dtype) / scale.
     """
     client = get_client()
-    streams = get_activity_streams(client, activity_id, types, resolution)
-    return streams.to_dict()
+    streams = await get_activity_streams(client, activity_id, types, resolution)
+    return streams.to_dict(compact=compact)
 
 
 @mcp.tool()
-def analyze_data_tool(code: str, data: Any) -> Any:
+async def analyze_data_tool(code: str, data: Any) -> Any:
     """
     Execute Python code to analyze Strava data safely using Monty.
 
@@ -158,7 +237,10 @@ def analyze_data_tool(code: str, data: Any) -> Any:
             pass  # Treat as raw string if not valid JSON
 
     try:
-        result = analyze_data(code, data)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            get_analysis_executor(), analyze_data, code, data
+        )
         return result
     except Exception as e:
         return f"Error executing code: {str(e)}"
@@ -1,41 +1,138 @@
 """Authentication and token management for Strava MCP Server."""
 
+import asyncio
+import json
+import os
 import sys
 import time
-from stravalib.client import Client
-from strava_mcp.config import CLIENT_ID, CLIENT_SECRET, REFRESH_TOKEN
+from strava_mcp.config import (
+    CLIENT_ID,
+    CLIENT_SECRET,
+    REFRESH_TOKEN,
+    STRAVA_OAUTH_TOKEN_URL,
+    TOKEN_CACHE_PATH,
+)
+from strava_mcp.http import StravaClient, get_http_client
+
+# Refresh only when the token has less than this many seconds left
+EXPIRY_SKEW = 60
 
 # Global state for token management
-_client = Client()
+_access_token = ""
+_refresh_token = REFRESH_TOKEN
 _token_expires_at = 0
+_refresh_lock = asyncio.Lock()
+
+
+def _load_token() -> None:
+    """Restore a previously persisted token so restarts don't force a refresh."""
+    global _access_token, _refresh_token, _token_expires_at
+
+    try:
+        with open(TOKEN_CACHE_PATH) as f:
+            payload = json.load(f)
+        # Ignore tokens issued to a different application, or seeded from a
+        # refresh token that has since been replaced in the environment
+        if payload.get("client_id") != CLIENT_ID:
+            return
+        if payload.get("seed_refresh_token") != REFRESH_TOKEN:
+            return
+        _access_token = payload["access_token"]
+        _refresh_token = payload["refresh_token"]
+        _token_expires_at = payload["expires_at"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+
+def _save_token() -> None:
+    """Persist the current token, readable only by the current user."""
+    try:
+        os.makedirs(os.path.dirname(TOKEN_CACHE_PATH), exist_ok=True)
+        fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(
+                {
+                    "client_id": CLIENT_ID,
+                    "seed_refresh_token": REFRESH_TOKEN,
+                    "access_token": _access_token,
+                    "refresh_token": _refresh_token,
+                    "expires_at": _token_expires_at,
+                },
+                f,
+            )
+    except OSError as e:
+        # Persistence is an optimization; keep serving with the in-memory token
+        sys.stderr.write(f"Warning: Could not persist Strava token: {e}\n")
 
 
-def get_client() -> Client:
+async def _refresh() -> None:
+    """Exchange the refresh token for a new access token."""
+    global _access_token, _refresh_token, _token_expires_at
+
+    try:
+        sys.stderr.write("Refreshing Strava access token...\n")
+        response = await get_http_client().post(
+            STRAVA_OAUTH_TOKEN_URL,
+            data={
+                "client_id": CLIENT_ID,
+                "client_secret": CLIENT_SECRET,
+                "grant_type": "refresh_token",
+                "refresh_token": _refresh_token,
+            },
+        )
+        response.raise_for_status()
+        payload = response.json()
+        _access_token = payload["access_token"]
+        _refresh_token = payload["refresh_token"]
+        _token_expires_at = payload["expires_at"]
+        sys.stderr.write("Token refreshed successfully.\n")
+    except Exception as e:
+        # Log full error to stderr for debugging
+        sys.stderr.write(f"Auth Error: {e}\n")
+        # Return generic error to client to avoid leaking secrets
+        raise RuntimeError("Failed to authenticate with Strava. Check server logs.")
+
+    _save_token()
+
+
+async def get_access_token() -> str:
     """
-    Returns an authenticated Strava client, refreshing the access token if necessary.
+    Returns a valid Strava access token, refreshing it if necessary.
+    Concurrent callers share a single refresh.
     """
-    global _client, _token_expires_at
-
-    # Buffer time to refresh before actual expiration (e.g., 5 minutes)
-    if time.time() > _token_expires_at - 300:
-        try:
-            sys.stderr.write("Refreshing Strava access token...\n")
-            # Ensure CLIENT_ID is correctly typed if needed, though stravalib handles str often
-            response = _client.refresh_access_token(
-                client_id=int(CLIENT_ID)
-                if CLIENT_ID and CLIENT_ID.isdigit()
-                else CLIENT_ID,  # type: ignore
-                client_secret=CLIENT_SECRET,  # type: ignore
-                refresh_token=REFRESH_TOKEN,  # type: ignore
-            )
-            _client.access_token = response["access_token"]
-            _client.refresh_token = response["refresh_token"]
-            _token_expires_at = response["expires_at"]
-            sys.stderr.write("Token refreshed successfully.\n")
-        except Exception as e:
-            # Log full error to stderr for debugging
-            sys.stderr.write(f"Auth Error: {e}\n")
-            # Return generic error to client to avoid leaking secrets
-            raise RuntimeError("Failed to authenticate with Strava. Check server logs.")
+    if time.time() < _token_expires_at - EXPIRY_SKEW:
+        return _access_token
+
+    async with _refresh_lock:
+        # Another caller may have refreshed while we waited for the lock
+        if time.time() >= _token_expires_at - EXPIRY_SKEW:
+            await _refresh()
 
+    return _access_token
+
+
+async def force_refresh() -> str:
+    """
+    Refreshes the access token regardless of its expiry, e.g. after a 401.
+    """
+    stale_token = _access_token
+
+    async with _refresh_lock:
+        # Skip if a concurrent caller already replaced the rejected token
+        if _access_token == stale_token:
+            await _refresh()
+
+    return _access_token
+
+
+_load_token()
+
+# Single client shared by all tools; tokens are fetched lazily per request
+_client = StravaClient(get_access_token, on_unauthorized=force_refresh)
+
+
+def get_client() -> StravaClient:
+    """
+    Returns the Strava API client, which authenticates each request on demand.
+    """
     return _client
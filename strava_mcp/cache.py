@@ -0,0 +1,185 @@
+"""In-process caching for Strava MCP Server services."""
+
+import asyncio
+import functools
+import inspect
+import sys
+from typing import Any, Awaitable, Callable, NamedTuple, Optional, TypeVar
+
+from cachetools import LRUCache, TTLCache
+
+T = TypeVar("T")
+
+# Every cache, so clear() can reach all of them
+_caches: list[Any] = []
+# Every per-activity cache, so invalidate() can reach all of them
+_activity_caches: list[Any] = []
+
+
+class CacheInfo(NamedTuple):
+    """Hit/miss counters of a cached service, like functools.lru_cache's."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+async def single_flight(
+    table: dict[Any, asyncio.Future], key: Any, factory: Callable[[], Awaitable[T]]
+) -> T:
+    """
+    Await the call in progress for `key`, or start one with `factory()`.
+
+    Concurrent callers with the same key share a single task, which leaves
+    `table` once it finishes. Callers must not mutate the shared result.
+    """
+    task = table.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        table[key] = task
+        task.add_done_callback(lambda _: table.pop(key, None))
+    # Shield so one caller being cancelled doesn't cancel the others
+    return await asyncio.shield(task)
+
+
+def _freeze(value: Any) -> Any:
+    """Convert unhashable argument values (lists) into hashable equivalents."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _ttl_cached(
+    ttl: float,
+    maxsize: int,
+    registries: list[list[Any]],
+    stale_on_error: bool = False,
+    getsizeof: Optional[Callable[[Any], int]] = None,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Build a TTL+LRU caching decorator whose caches join the given registries."""
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl, getsizeof=getsizeof)
+        # Last result per key, kept past expiry to serve when the API fails
+        stale: Optional[LRUCache] = (
+            LRUCache(maxsize=maxsize, getsizeof=getsizeof) if stale_on_error else None
+        )
+        for registry in registries:
+            registry.append(cache)
+            if stale is not None:
+                registry.append(stale)
+        signature = inspect.signature(func)
+        # Loads in progress, so concurrent misses for a key share one call
+        pending: dict[tuple, asyncio.Future] = {}
+        hits = misses = 0
+
+        async def load(key: tuple, args: tuple, kwargs: dict) -> T:
+            try:
+                result = await func(*args, **kwargs)
+            except RuntimeError:
+                if stale is None or key not in stale:
+                    raise
+                sys.stderr.write(
+                    f"Warning: {func.__name__} failed, serving a stale result\n"
+                )
+                return stale[key]
+
+            try:
+                cache[key] = result
+                if stale is not None:
+                    stale[key] = result
+            except ValueError:
+                # Larger than the whole cache; serve it without storing
+                pass
+            return result
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, force_refresh: bool = False, **kwargs: Any) -> T:
+            nonlocal hits, misses
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(
+                _freeze(value)
+                for name, value in bound.arguments.items()
+                if name != "client"
+            )
+
+            if not force_refresh:
+                try:
+                    result = cache[key]
+                    hits += 1
+                    return result
+                except KeyError:
+                    pass
+
+            def start() -> Awaitable[T]:
+                nonlocal misses
+                misses += 1
+                return load(key, args, kwargs)
+
+            return await single_flight(pending, key, start)
+
+        def cache_info() -> CacheInfo:
+            return CacheInfo(hits, misses, maxsize, cache.currsize)
+
+        wrapper.cache_info = cache_info  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def cached(
+    ttl: float, maxsize: int = 128, stale_on_error: bool = False
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Cache an async service function's result in a TTL+LRU cache.
+
+    The cache key is every argument except `client`. Pass `force_refresh=True`
+    to skip the cached entry and store a fresh result; `cache_info()` on the
+    wrapper reports hit/miss counters.
+
+    Args:
+        ttl: Seconds before a cached entry expires.
+        maxsize: Maximum number of entries before least-recently-used eviction.
+        stale_on_error: If the function raises RuntimeError (e.g. Strava 429 or
+                        5xx), return the last result for the same arguments,
+                        however old, instead of propagating the error.
+    """
+    return _ttl_cached(ttl, maxsize, [_caches], stale_on_error)
+
+
+def cached_by_activity(
+    ttl: float,
+    maxsize: int = 2048,
+    getsizeof: Optional[Callable[[Any], int]] = None,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Cache an async service function's result in a TTL+LRU cache.
+
+    The wrapped function must take `(client, activity_id, ...)`. The cache key is
+    every argument except `client`, with `activity_id` first so that entries can
+    be dropped with `invalidate(activity_id)`. Otherwise behaves like `cached`.
+
+    Args:
+        ttl: Seconds before a cached entry expires.
+        maxsize: Maximum number of entries before least-recently-used eviction,
+                 or total size when `getsizeof` is given.
+        getsizeof: Size of a cached result (e.g. its bytes); results larger
+                   than `maxsize` are returned without being cached.
+    """
+    return _ttl_cached(ttl, maxsize, [_caches, _activity_caches], getsizeof=getsizeof)
+
+
+def invalidate(activity_id: int) -> None:
+    """Drop every cached entry for an activity."""
+    for cache in _activity_caches:
+        for key in [k for k in cache.keys() if k[0] == activity_id]:
+            cache.pop(key, None)
+
+
+def clear() -> None:
+    """Drop every cached entry."""
+    for cache in _caches:
+        cache.clear()
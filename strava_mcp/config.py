@@ -18,3 +18,43 @@ if not all([CLIENT_ID, CLIENT_SECRET, REFRESH_TOKEN]):
     sys.stderr.write(
         "Warning: STRAVA_CLIENT_ID, STRAVA_CLIENT_SECRET, or STRAVA_REFRESH_TOKEN not set in environment.\n"
     )
+
+# HTTP connection pool settings
+STRAVA_API_BASE_URL = "https://www.strava.com/api/v3"
+STRAVA_OAUTH_TOKEN_URL = "https://www.strava.com/oauth/token"
+MAX_CONNECTIONS = int(os.getenv("STRAVA_MAX_CONNECTIONS", 100))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("STRAVA_MAX_KEEPALIVE", 20))
+REQUEST_TIMEOUT = float(os.getenv("STRAVA_TIMEOUT", 30))
+CONNECT_TIMEOUT = float(os.getenv("STRAVA_CONNECT_TIMEOUT", 5))
+
+# Bytes of recent list responses kept for ETag revalidation (If-None-Match)
+ETAG_CACHE_BYTES = int(os.getenv("STRAVA_ETAG_CACHE_BYTES", 8 * 1024 * 1024))
+
+# Cache lifetimes (seconds). Laps and streams never change once uploaded,
+# while activity names and descriptions can still be edited.
+ACTIVITY_DETAILS_TTL = int(os.getenv("STRAVA_ACTIVITY_TTL", 3600))
+ACTIVITY_DATA_TTL = int(os.getenv("STRAVA_ACTIVITY_DATA_TTL", 365 * 24 * 3600))
+# Streams are large, so their cache is bounded by bytes rather than entries
+STREAMS_CACHE_BYTES = int(os.getenv("STRAVA_STREAMS_CACHE_BYTES", 64 * 1024 * 1024))
+# New activities can appear at any time, so recent-activity lists expire fast
+ACTIVITY_LIST_TTL = int(os.getenv("STRAVA_ACTIVITY_LIST_TTL", 10))
+# The athlete profile rarely changes; stats move with every new activity
+ATHLETE_TTL = int(os.getenv("STRAVA_ATHLETE_TTL", 300))
+ATHLETE_STATS_TTL = int(os.getenv("STRAVA_ATHLETE_STATS_TTL", 30))
+
+# Where refreshed OAuth tokens are persisted between restarts
+TOKEN_CACHE_PATH = os.path.expanduser(
+    os.getenv("STRAVA_TOKEN_CACHE", "~/.cache/strava_mcp/token.json")
+)
+
+# Rate limiting: Strava allows N requests per 15 minutes and per day
+MAX_IN_FLIGHT_REQUESTS = int(os.getenv("STRAVA_MAX_IN_FLIGHT", 10))
+RATE_LIMIT_THRESHOLD = float(os.getenv("STRAVA_RATE_LIMIT_THRESHOLD", 0.95))
+RATE_LIMIT_RETRIES = 3
+
+# Activity pagination: Strava caps per_page at 200
+ACTIVITIES_PER_PAGE = 200
+MAX_SEARCH_PAGES = int(os.getenv("STRAVA_MAX_SEARCH_PAGES", 5))
+
+# Worker threads for analyze_data; Monty releases the GIL while it runs
+ANALYSIS_WORKERS = int(os.getenv("STRAVA_ANALYSIS_WORKERS", 2))
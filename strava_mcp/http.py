@@ -0,0 +1,257 @@
+"""Shared async HTTP client for the Strava REST API."""
+
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+import msgspec
+from cachetools import LRUCache
+
+from strava_mcp.cache import single_flight
+from strava_mcp.config import (
+    STRAVA_API_BASE_URL,
+    MAX_CONNECTIONS,
+    MAX_KEEPALIVE_CONNECTIONS,
+    REQUEST_TIMEOUT,
+    CONNECT_TIMEOUT,
+    ETAG_CACHE_BYTES,
+    MAX_IN_FLIGHT_REQUESTS,
+    RATE_LIMIT_THRESHOLD,
+    RATE_LIMIT_RETRIES,
+)
+
+# Untyped fallback for requests made without a schema-specific decoder
+_json_decoder = msgspec.json.Decoder()
+
+# Process-wide connection pool, so tool calls reuse TCP+TLS connections
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared connection pool, creating it on first use so that
+    importing the server doesn't pay for TLS context setup.
+    """
+    global _client
+
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=STRAVA_API_BASE_URL,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+            http2=True,
+        )
+    return _client
+
+
+def seconds_until_next_quarter_hour(now: Optional[float] = None) -> int:
+    """Seconds until Strava's 15-minute rate-limit window resets (UTC-aligned)."""
+    now = time.time() if now is None else now
+    return 900 - int(now) % 900
+
+
+@dataclass
+class RateLimitState:
+    """Latest Strava rate-limit usage, as reported by response headers."""
+
+    short_usage: int = 0
+    short_limit: int = 0
+    long_usage: int = 0
+    long_limit: int = 0
+    # 15-minute window (time // 900) the short-term usage was reported in
+    window: int = -1
+
+    def update(self, headers: httpx.Headers) -> None:
+        """Update from X-RateLimit-* headers, preferring the read-specific ones."""
+        usage = headers.get("X-ReadRateLimit-Usage") or headers.get("X-RateLimit-Usage")
+        limit = headers.get("X-ReadRateLimit-Limit") or headers.get("X-RateLimit-Limit")
+        if not usage or not limit:
+            return
+        try:
+            self.short_usage, self.long_usage = (int(v) for v in usage.split(","))
+            self.short_limit, self.long_limit = (int(v) for v in limit.split(","))
+            self.window = int(time.time() // 900)
+        except ValueError:
+            sys.stderr.write(
+                f"Warning: Unexpected rate limit headers: {usage}/{limit}\n"
+            )
+
+    def near_short_limit(self) -> bool:
+        """Whether the current 15-minute window is nearly used up."""
+        # Usage from an earlier window says nothing about the reset quota
+        if self.window != int(time.time() // 900):
+            return False
+        return bool(self.short_limit) and (
+            self.short_usage / self.short_limit > RATE_LIMIT_THRESHOLD
+        )
+
+    def long_limit_exhausted(self) -> bool:
+        """Whether the daily quota is used up, which waiting 15 minutes won't fix."""
+        return bool(self.long_limit) and self.long_usage >= self.long_limit
+
+
+class StravaClient:
+    """Authenticated async client for the Strava REST API."""
+
+    def __init__(
+        self,
+        token_provider: Callable[[], Awaitable[str]],
+        http: Optional[httpx.AsyncClient] = None,
+        on_unauthorized: Optional[Callable[[], Awaitable[str]]] = None,
+        max_in_flight: int = MAX_IN_FLIGHT_REQUESTS,
+    ) -> None:
+        self._token_provider = token_provider
+        self._on_unauthorized = on_unauthorized
+        self._http = http
+        # Bound concurrent requests so fan-out doesn't stampede the quota
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.rate_limit = RateLimitState()
+        # Authenticated athlete id, memoized after the first /athlete call
+        self.athlete_id: Optional[int] = None
+        # (path, params) -> (ETag, body) of the last conditional response
+        self._etag_cache: LRUCache = LRUCache(
+            maxsize=ETAG_CACHE_BYTES, getsizeof=lambda entry: len(entry[1])
+        )
+        # (path, params, decoder) -> task of the identical request in flight
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+    async def _send(
+        self,
+        path: str,
+        params: Optional[dict[str, Any]],
+        headers: Optional[dict[str, str]] = None,
+    ) -> httpx.Response:
+        """Send an authenticated GET, retrying once with a fresh token on 401."""
+        http = self._http or get_http_client()
+        token = await self._token_provider()
+        try:
+            response = await http.get(
+                path,
+                params=params,
+                headers={**(headers or {}), "Authorization": f"Bearer {token}"},
+            )
+
+            # A revoked or prematurely expired token: refresh once and retry
+            if response.status_code == 401 and self._on_unauthorized is not None:
+                token = await self._on_unauthorized()
+                response = await http.get(
+                    path,
+                    params=params,
+                    headers={**(headers or {}), "Authorization": f"Bearer {token}"},
+                )
+        except httpx.HTTPError as e:
+            # Connection failures and timeouts surface like any other API error
+            sys.stderr.write(f"Strava API Error: GET {path} failed: {e}\n")
+            raise RuntimeError("Strava API request failed. Check server logs.")
+
+        self.rate_limit.update(response.headers)
+        return response
+
+    async def get(
+        self,
+        path: str,
+        params: Optional[dict[str, Any]] = None,
+        decoder: Optional[msgspec.json.Decoder] = None,
+        conditional: bool = False,
+    ) -> Any:
+        """
+        Issue a GET request against the Strava API and return the decoded JSON.
+
+        Identical concurrent requests share a single API call, so callers must
+        not mutate the returned value.
+
+        Args:
+            path: API path relative to the base URL (e.g. "/athlete")
+            params: Optional query parameters
+            decoder: Optional msgspec decoder for a typed response; fields not
+                     declared on its type are skipped while decoding
+            conditional: Revalidate with the ETag of the previous response,
+                         reusing its body when Strava answers 304 Not Modified
+        """
+        key = (path, frozenset((params or {}).items()), decoder)
+        return await single_flight(
+            self._inflight,
+            key,
+            lambda: self._fetch(path, params, decoder, conditional),
+        )
+
+    async def _fetch(
+        self,
+        path: str,
+        params: Optional[dict[str, Any]],
+        decoder: Optional[msgspec.json.Decoder],
+        conditional: bool,
+    ) -> Any:
+        """Perform a rate-limited GET and decode the response body."""
+        etag_key = None
+        headers = None
+        cached = None
+        if conditional:
+            etag_key = (path, frozenset((params or {}).items()))
+            cached = self._etag_cache.get(etag_key)
+            if cached is not None:
+                headers = {"If-None-Match": cached[0]}
+
+        # Waits happen outside the semaphore so they don't hold up other requests
+        if self.rate_limit.near_short_limit():
+            delay = seconds_until_next_quarter_hour()
+            sys.stderr.write(f"Near Strava rate limit, waiting {delay}s...\n")
+            await asyncio.sleep(delay)
+
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            async with self._semaphore:
+                response = await self._send(path, params, headers)
+            if response.status_code != 429:
+                break
+            if self.rate_limit.long_limit_exhausted() or attempt == RATE_LIMIT_RETRIES:
+                sys.stderr.write(f"Strava API Error: GET {path} rate limited\n")
+                raise RuntimeError("Strava API rate limit exceeded. Try again later.")
+            # Wait for the window to reset, backing off further on repeats
+            delay = seconds_until_next_quarter_hour() + 2**attempt
+            sys.stderr.write(f"Strava rate limit hit, retrying in {delay}s...\n")
+            await asyncio.sleep(delay)
+
+        if response.status_code == 304 and cached is not None:
+            # Use the body captured above; the entry may since have been evicted
+            body = cached[1]
+        elif response.status_code == 200:
+            body = response.content
+            etag = response.headers.get("ETag")
+            if etag_key is not None and etag:
+                try:
+                    self._etag_cache[etag_key] = (etag, body)
+                except ValueError:
+                    # Larger than the whole cache; just don't revalidate it
+                    pass
+        else:
+            # Log the status to stderr and keep the response body out of the error
+            sys.stderr.write(
+                f"Strava API Error: GET {path} returned {response.status_code}\n"
+            )
+            raise RuntimeError(
+                f"Strava API request failed with status {response.status_code}."
+            )
+
+        decode = (decoder or _json_decoder).decode
+        try:
+            # Decoded inline: msgspec holds the GIL throughout, so a worker
+            # thread would block the event loop just as long
+            return decode(body)
+        except msgspec.DecodeError as e:
+            sys.stderr.write(f"Strava API Error: GET {path} returned bad JSON: {e}\n")
+            raise RuntimeError("Strava API returned an unexpected response.")
+
+
+async def on_shutdown() -> None:
+    """Close the shared connection pool, if it was ever opened."""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,10 +1,108 @@
 """Data models for Strava MCP Server."""
 
-from dataclasses import dataclass, asdict, field
-from typing import Optional
+import base64
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field, fields
+from itertools import chain
+from typing import Any, Optional, Sequence
 
+# array typecodes for the compact in-memory form of each stream channel
+# Sensor readings use int16, and out-of-range data falls back to a list. Floats
+# stay doubles so GPS and distances serialize without rounding noise.
+STREAM_TYPECODES = {
+    "time": "i",
+    "latlng": "d",
+    "distance": "d",
+    "altitude": "d",
+    "velocity_smooth": "d",
+    "heartrate": "h",
+    "cadence": "h",
+    "watts": "h",
+    "temp": "h",
+    "moving": "b",
+    "grade_smooth": "d",
+}
 
-@dataclass
+
+# Compact wire encoding per channel: (dtype, struct format code, fixed-point scale)
+# Decode with np.frombuffer(base64.b64decode(data), dtype) / scale
+COMPACT_STREAM_FORMATS = {
+    "time": ("<i4", "i", 1),
+    "latlng": ("<i4", "i", 10_000_000),
+    "distance": ("<f4", "f", 1),
+    "altitude": ("<f2", "e", 1),
+    "velocity_smooth": ("<i2", "h", 100),
+    "heartrate": ("<u1", "B", 1),
+    "cadence": ("<i2", "h", 1),
+    "watts": ("<i2", "h", 1),
+    "temp": ("<i2", "h", 1),
+    "moving": ("<u1", "B", 1),
+    "grade_smooth": ("<f2", "e", 1),
+}
+
+
+def _field_dict(obj: Any) -> dict:
+    """Map dataclass fields to their values without deep-copying them like asdict."""
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+
+def pack_stream(name: str, data: Optional[list]) -> Optional[Sequence]:
+    """
+    Store stream samples in a typed array instead of a list of boxed values.
+
+    latlng pairs are flattened to interleaved lat, lng values. Data that doesn't
+    fit the channel's type (e.g. null samples) is kept as a plain list.
+    """
+    if data is None or name not in STREAM_TYPECODES:
+        return data
+    try:
+        values = chain.from_iterable(data) if name == "latlng" else data
+        return array(STREAM_TYPECODES[name], values)
+    except (TypeError, ValueError, OverflowError):
+        return data
+
+
+def unpack_stream(name: str, data: Sequence) -> list:
+    """Convert a packed stream channel back to the JSON-friendly list form."""
+    if not isinstance(data, array):
+        return data
+    if name == "latlng":
+        return [[data[i], data[i + 1]] for i in range(0, len(data), 2)]
+    if name == "moving":
+        return [bool(v) for v in data]
+    return data.tolist()
+
+
+def _quantize(name: str, data: Sequence) -> Any:
+    """
+    Encode a stream channel at its natural minimum precision.
+
+    Returns a `{"dtype", "scale", "data"}` envelope with base64 little-endian
+    bytes, or the plain list when the samples don't fit the compact type.
+    """
+    dtype, code, scale = COMPACT_STREAM_FORMATS[name]
+    try:
+        # Packed latlng arrays are already flat; plain lists still hold pairs
+        if name == "latlng" and not isinstance(data, array):
+            values = list(chain.from_iterable(data))
+        else:
+            values = list(data)
+        if code in "iBh":
+            values = [round(v * scale) for v in values]
+        packed = struct.pack(f"<{len(values)}{code}", *values)
+    except (struct.error, OverflowError, TypeError):
+        return unpack_stream(name, data)
+
+    envelope = {"dtype": dtype, "scale": scale}
+    if name == "latlng":
+        envelope["shape"] = [len(values) // 2, 2]
+    envelope["data"] = base64.b64encode(packed).decode("ascii")
+    return envelope
+
+
+@dataclass(slots=True, frozen=True)
 class ActivityTotals:
     """Represents activity totals (distance, time, etc.)."""
 
@@ -13,7 +111,7 @@ class ActivityTotals:
     elevation_gain: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AthleteStats:
     """Statistics for the authenticated athlete."""
 
@@ -38,7 +136,7 @@ Recent Ride Totals:
 """
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActivitySummary:
     """Summary of a Strava activity."""
 
@@ -54,10 +152,10 @@ class ActivitySummary:
 
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
-        return asdict(self)
+        return _field_dict(self)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActivityDetails:
     """Detailed information about a Strava activity."""
 
@@ -76,10 +174,22 @@ class ActivityDetails:
 
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
-        return asdict(self)
+        return _field_dict(self)
+
 
+@dataclass(slots=True, frozen=True)
+class ActivityError:
+    """An activity in a batch request that could not be retrieved."""
+
+    id: int
+    error: str
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for serialization."""
+        return _field_dict(self)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class LapSummary:
     """Summary of a lap in a Strava activity."""
 
@@ -100,25 +210,53 @@ class LapSummary:
 
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization."""
-        return asdict(self)
+        return _field_dict(self)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ActivityStreams:
-    """Raw stream data for a Strava activity."""
-
-    time: Optional[list[int]] = None
-    latlng: Optional[list[list[float]]] = None
-    distance: Optional[list[float]] = None
-    altitude: Optional[list[float]] = None
-    velocity_smooth: Optional[list[float]] = None
-    heartrate: Optional[list[int]] = None
-    cadence: Optional[list[int]] = None
-    watts: Optional[list[int]] = None
-    temp: Optional[list[int]] = None
-    moving: Optional[list[bool]] = None
-    grade_smooth: Optional[list[float]] = None
+    """
+    Raw stream data for a Strava activity.
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary for serialization, excluding None values."""
-        return {k: v for k, v in asdict(self).items() if v is not None}
+    Channels are typed arrays (see `pack_stream`) or plain lists; packed latlng
+    holds interleaved lat, lng values.
+    """
+
+    time: Optional[Sequence[int]] = None
+    latlng: Optional[Sequence] = None
+    distance: Optional[Sequence[float]] = None
+    altitude: Optional[Sequence[float]] = None
+    velocity_smooth: Optional[Sequence[float]] = None
+    heartrate: Optional[Sequence[int]] = None
+    cadence: Optional[Sequence[int]] = None
+    watts: Optional[Sequence[int]] = None
+    temp: Optional[Sequence[int]] = None
+    moving: Optional[Sequence[bool]] = None
+    grade_smooth: Optional[Sequence[float]] = None
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the channels, for byte-bounded caching."""
+        total = 0
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, array):
+                total += value.itemsize * len(value)
+            elif value is not None:
+                # Unpacked lists hold a pointer and a boxed value per sample
+                total += sys.getsizeof(value) + 32 * len(value)
+        return total
+
+    def to_dict(self, compact: bool = False) -> dict:
+        """
+        Convert to dictionary for serialization, excluding None values.
+
+        With `compact=True`, each channel is a quantized base64 envelope
+        (see `COMPACT_STREAM_FORMATS`) instead of a list.
+        """
+        convert = _quantize if compact else unpack_stream
+        # Typed arrays become lists here; plain lists are shared, not copied
+        return {
+            f.name: convert(f.name, value)
+            for f in fields(self)
+            if (value := getattr(self, f.name)) is not None
+        }
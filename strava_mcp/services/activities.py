@@ -1,42 +1,202 @@
 """Activity-related services for Strava MCP Server."""
 
+import asyncio
+import functools
 import sys
 import datetime
-from typing import Optional
-from stravalib.client import Client
+from typing import AsyncIterator, Callable, Optional
+import msgspec
+from strava_mcp.cache import cached, cached_by_activity
+from strava_mcp.config import (
+    ACTIVITY_DETAILS_TTL,
+    ACTIVITY_LIST_TTL,
+    ACTIVITIES_PER_PAGE,
+    MAX_SEARCH_PAGES,
+)
+from strava_mcp.http import StravaClient
 from strava_mcp.models import ActivitySummary, ActivityDetails
 
+# Strava responses decode straight into the services' _Raw* Structs. Decoding
+# coerces numbers to the declared types, so converters to the public models
+# (_to_summary here, _to_lap in streams) only need defaults for missing values.
 
-def list_activities(client: Client, limit: int) -> list[ActivitySummary]:
-    """List recent activities for the authenticated athlete."""
-    activities = client.get_activities(limit=limit)
 
-    result = []
-    for activity in activities:
-        # Handle moving_time safely
-        moving_time = (
-            getattr(activity.moving_time, "seconds", 0) if activity.moving_time else 0
-        )
+class _RawActivity(msgspec.Struct):
+    """The fields read from a Strava activity; all others are skipped."""
+
+    id: Optional[int] = None
+    name: Optional[str] = None
+    type: Optional[str] = None
+    start_date: Optional[str] = None
+    distance: Optional[float] = None
+    moving_time: Optional[int] = None
+    total_elevation_gain: Optional[float] = None
+    average_speed: Optional[float] = None
+    max_speed: Optional[float] = None
+
+
+class _RawActivityDetails(_RawActivity):
+    """The extra fields read from Strava's detailed activity response."""
+
+    description: Optional[str] = None
+    elapsed_time: Optional[int] = None
+    calories: Optional[float] = None
+    device_name: Optional[str] = None
+
+
+_activities_decoder = msgspec.json.Decoder(list[_RawActivity])
+_details_decoder = msgspec.json.Decoder(_RawActivityDetails)
+
+
+# Python 3.11+ parses the "Z" suffix (and most other ISO 8601 forms) natively
+if sys.version_info >= (3, 11):
+    _fromisoformat = datetime.datetime.fromisoformat
+else:
+
+    def _fromisoformat(value: str) -> datetime.datetime:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _parse_epoch(value: str, name: str) -> Optional[int]:
+    """Parse an ISO 8601 date string into a Unix timestamp (naive dates are UTC)."""
+    try:
+        parsed = _fromisoformat(value)
+    except ValueError:
+        sys.stderr.write(f"Warning: Invalid '{name}' date format: {value}\n")
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return int(parsed.timestamp())
+
+
+# Search filter terms, most selective and cheapest first so `and` short-circuits.
+# Only these fixed snippets are compiled; filter values are bound as globals.
+_FILTER_TERMS = (
+    ("min_distance", "(a.distance or 0.0) >= min_distance"),
+    ("max_distance", "(a.distance or 0.0) <= max_distance"),
+    ("type_folded", "type_folded in (a.type or '').casefold()"),
+    ("query_folded", "query_folded in (a.name or '').casefold()"),
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_matcher(
+    query_folded: Optional[str],
+    type_folded: Optional[str],
+    min_distance: Optional[float],
+    max_distance: Optional[float],
+) -> Callable[[_RawActivity], bool]:
+    """
+    Compile the active search filters into a single predicate, so inactive
+    filters cost nothing per activity.
+    """
+    values = {
+        "query_folded": query_folded,
+        "type_folded": type_folded,
+        "min_distance": min_distance,
+        "max_distance": max_distance,
+    }
+    terms = [term for name, term in _FILTER_TERMS if values[name] is not None]
+    source = "lambda a: " + (" and ".join(terms) or "True")
+    return eval(compile(source, "<filter>", "eval"), {"__builtins__": {}, **values})
+
+
+def _intern_type(activity_type: Optional[str]) -> str:
+    """
+    Share one string object per activity type (e.g. "Run") across all cached
+    activities, rather than one decoded copy per activity.
+    """
+    return sys.intern(activity_type) if activity_type else ""
+
+
+def _to_summary(activity: _RawActivity) -> ActivitySummary:
+    """Build an ActivitySummary from a raw Strava activity."""
+    return ActivitySummary(
+        id=activity.id or 0,
+        name=activity.name or "",
+        type=_intern_type(activity.type),
+        start_date=activity.start_date,
+        distance=activity.distance or 0.0,
+        moving_time=activity.moving_time or 0,
+        total_elevation_gain=activity.total_elevation_gain or 0.0,
+        average_speed=activity.average_speed or 0.0,
+        max_speed=activity.max_speed or 0.0,
+    )
+
+
+# Pages fetched concurrently once the first page shows more are available
+PAGE_FETCH_CONCURRENCY = 4
+
+
+async def iter_activity_pages(
+    client: StravaClient,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    per_page: int = ACTIVITIES_PER_PAGE,
+    max_pages: int = MAX_SEARCH_PAGES,
+) -> AsyncIterator[list[_RawActivity]]:
+    """
+    Yield pages of raw activities, newest first.
 
-        summary = ActivitySummary(
-            id=activity.id or 0,
-            name=activity.name or "",
-            type=str(activity.type),
-            start_date=activity.start_date.isoformat() if activity.start_date else None,
-            distance=float(activity.distance) if activity.distance else 0.0,
-            moving_time=moving_time,
-            total_elevation_gain=float(activity.total_elevation_gain)
-            if activity.total_elevation_gain
-            else 0.0,
-            average_speed=float(activity.average_speed or 0.0),
-            max_speed=float(activity.max_speed or 0.0),
+    The first page is fetched alone; if it is full, later pages are fetched
+    concurrently in batches. Stop iterating to avoid fetching further pages.
+    Pages are revalidated by ETag, so unchanged pages are not re-downloaded.
+
+    Args:
+        after: Unix timestamp - only activities after this time
+        before: Unix timestamp - only activities before this time
+        per_page: Activities per page (Strava allows up to 200)
+        max_pages: Maximum number of pages to fetch
+    """
+    params: dict = {"per_page": per_page}
+    if after is not None:
+        params["after"] = after
+    if before is not None:
+        params["before"] = before
+
+    page = await client.get(
+        "/athlete/activities",
+        params={**params, "page": 1},
+        decoder=_activities_decoder,
+        conditional=True,
+    )
+    yield page
+
+    next_page = 2
+    while len(page) == per_page and next_page <= max_pages:
+        numbers = range(
+            next_page, min(next_page + PAGE_FETCH_CONCURRENCY, max_pages + 1)
         )
-        result.append(summary)
-    return result
+        pages = await asyncio.gather(
+            *(
+                client.get(
+                    "/athlete/activities",
+                    params={**params, "page": n},
+                    decoder=_activities_decoder,
+                    conditional=True,
+                )
+                for n in numbers
+            )
+        )
+        for page in pages:
+            yield page
+            if len(page) < per_page:
+                return
+        next_page += len(numbers)
+
+
+@cached(ttl=ACTIVITY_LIST_TTL, stale_on_error=True)
+async def list_activities(client: StravaClient, limit: int) -> list[ActivitySummary]:
+    """
+    List recent activities for the authenticated athlete.
+    If Strava fails, the last list for the same limit is returned instead.
+    """
+    pages = iter_activity_pages(client, per_page=limit, max_pages=1)
+    return [_to_summary(activity) async for page in pages for activity in page]
 
 
-def search_activities(
-    client: Client,
+async def search_activities(
+    client: StravaClient,
     query: Optional[str] = None,
     activity_type: Optional[str] = None,
     after: Optional[str] = None,
@@ -46,95 +206,62 @@ def search_activities(
     limit: int = 50,
 ) -> list[ActivitySummary]:
     """Search activities with optional filters."""
-    # Parse date strings if provided
-    after_date = None
-    before_date = None
-
-    if after:
-        try:
-            after_date = datetime.datetime.fromisoformat(after.replace("Z", "+00:00"))
-        except ValueError:
-            sys.stderr.write(f"Warning: Invalid 'after' date format: {after}\n")
-
-    if before:
-        try:
-            before_date = datetime.datetime.fromisoformat(before.replace("Z", "+00:00"))
-        except ValueError:
-            sys.stderr.write(f"Warning: Invalid 'before' date format: {before}\n")
-
-    # Fetch activities with date filters
-    activities = client.get_activities(
-        before=before_date, after=after_date, limit=limit
-    )
+    # Without filters this is just the most recent activities, one page and cached
+    if (
+        not (query or activity_type or after or before)
+        and min_distance is None
+        and max_distance is None
+        and limit <= ACTIVITIES_PER_PAGE
+    ):
+        return await list_activities(client, limit)
 
-    result = []
-    query_lower = query.lower() if query else None
-    type_lower = activity_type.lower() if activity_type else None
+    # Date filters are applied by Strava, which expects Unix timestamps
+    after_epoch = _parse_epoch(after, "after") if after else None
+    before_epoch = _parse_epoch(before, "before") if before else None
 
-    for activity in activities:
-        # Handle moving_time safely
-        moving_time = (
-            getattr(activity.moving_time, "seconds", 0) if activity.moving_time else 0
-        )
+    result: list[ActivitySummary] = []
+    # Case-fold the needles once; casefold also matches e.g. "ß" with "ss"
+    matches = _compile_matcher(
+        query.casefold() if query else None,
+        activity_type.casefold() if activity_type else None,
+        min_distance,
+        max_distance,
+    )
 
-        # Get activity details
-        activity_name = activity.name or ""
-        activity_type_str = str(activity.type)
-        activity_distance = float(activity.distance) if activity.distance else 0.0
-
-        # Apply filters
-        if query_lower and query_lower not in activity_name.lower():
-            continue
-
-        if type_lower and type_lower not in activity_type_str.lower():
-            continue
-
-        if min_distance is not None and activity_distance < min_distance:
-            continue
-
-        if max_distance is not None and activity_distance > max_distance:
-            continue
-
-        summary = ActivitySummary(
-            id=activity.id or 0,
-            name=activity_name,
-            type=activity_type_str,
-            start_date=activity.start_date.isoformat() if activity.start_date else None,
-            distance=activity_distance,
-            moving_time=moving_time,
-            total_elevation_gain=float(activity.total_elevation_gain)
-            if activity.total_elevation_gain
-            else 0.0,
+    pages = iter_activity_pages(client, after=after_epoch, before=before_epoch)
+    async for page in pages:
+        # Filter a whole page per pass; summaries are only built for matches
+        matched = list(filter(matches, page))
+        result.extend(
+            _to_summary(activity) for activity in matched[: limit - len(result)]
         )
-        result.append(summary)
+
+        # Stop paging as soon as enough matches are found
+        if len(result) >= limit:
+            await pages.aclose()
+            break
 
     return result
 
 
-def get_activity_details(client: Client, activity_id: int) -> ActivityDetails:
+@cached_by_activity(ttl=ACTIVITY_DETAILS_TTL)
+async def get_activity_details(
+    client: StravaClient, activity_id: int
+) -> ActivityDetails:
     """Get detailed information for a specific activity."""
-    activity = client.get_activity(activity_id)
-
-    moving_time = (
-        getattr(activity.moving_time, "seconds", 0) if activity.moving_time else 0
-    )
-    elapsed_time = (
-        getattr(activity.elapsed_time, "seconds", 0) if activity.elapsed_time else 0
-    )
+    activity = await client.get(f"/activities/{activity_id}", decoder=_details_decoder)
 
     return ActivityDetails(
         id=activity.id or 0,
         name=activity.name or "",
         description=activity.description,
-        type=str(activity.type),
-        distance=float(activity.distance) if activity.distance else 0.0,
-        moving_time=moving_time,
-        elapsed_time=elapsed_time,
-        total_elevation_gain=float(activity.total_elevation_gain)
-        if activity.total_elevation_gain
-        else 0.0,
-        average_speed=float(activity.average_speed) if activity.average_speed else 0.0,
-        max_speed=float(activity.max_speed) if activity.max_speed else 0.0,
+        type=_intern_type(activity.type),
+        distance=activity.distance or 0.0,
+        moving_time=activity.moving_time or 0,
+        elapsed_time=activity.elapsed_time or 0,
+        total_elevation_gain=activity.total_elevation_gain or 0.0,
+        average_speed=activity.average_speed or 0.0,
+        max_speed=activity.max_speed or 0.0,
         calories=activity.calories,
         device_name=activity.device_name,
     )
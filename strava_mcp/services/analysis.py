@@ -1,5 +1,127 @@
-from typing import Any
+import ast
+import functools
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
 import pydantic_monty
+from cachetools import LRUCache
+from strava_mcp.config import ANALYSIS_WORKERS
+
+# Long-lived workers for analyses, so slow snippets can't tie up the default
+# executor that large API responses are decoded in
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_analysis_executor() -> ThreadPoolExecutor:
+    """Returns the analysis worker pool, creating it on first use."""
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=ANALYSIS_WORKERS, thread_name_prefix="monty"
+        )
+    return _executor
+
+
+def shutdown_analysis_executor() -> None:
+    """Stop the analysis worker pool, if it was ever started."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+# Reductions computed natively when the snippet is just `f(x['key'] for x in data)`.
+# sum adds left to right like Monty, not with builtin sum's compensated floats.
+_REDUCTIONS: dict[str, Callable[..., Any]] = {
+    "sum": lambda values: functools.reduce(operator.add, values, 0),
+    "max": max,
+    "min": min,
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _match_reduction(code: str) -> Optional[tuple[Callable[..., Any], str]]:
+    """
+    Recognize `sum/max/min(item['key'] for item in data)` snippets.
+    Returns the reduction and key, or None for any other code.
+    """
+    try:
+        tree = ast.parse(code.strip(), mode="eval")
+    except SyntaxError:
+        return None
+
+    call = tree.body
+    if not (
+        isinstance(call, ast.Call)
+        and isinstance(call.func, ast.Name)
+        and call.func.id in _REDUCTIONS
+        and len(call.args) == 1
+        and not call.keywords
+        and isinstance(call.args[0], ast.GeneratorExp)
+    ):
+        return None
+
+    gen = call.args[0]
+    if len(gen.generators) != 1:
+        return None
+    comp = gen.generators[0]
+    elt = gen.elt
+    if not (
+        isinstance(comp.target, ast.Name)
+        and isinstance(comp.iter, ast.Name)
+        and comp.iter.id == "data"
+        and not comp.ifs
+        and not comp.is_async
+        and isinstance(elt, ast.Subscript)
+        and isinstance(elt.value, ast.Name)
+        and elt.value.id == comp.target.id
+        and isinstance(elt.slice, ast.Constant)
+        and isinstance(elt.slice.value, str)
+    ):
+        return None
+
+    return _REDUCTIONS[call.func.id], elt.slice.value
+
+
+def _reduce_natively(code: str, data: Any) -> Optional[Any]:
+    """
+    Compute a recognized reduction over a list of dicts without the sandbox.
+    Returns None when anything is unusual, so Monty handles (and reports) it.
+    """
+    match = _match_reduction(code)
+    if match is None or not isinstance(data, list) or not data:
+        return None
+
+    reduce, key = match
+    values = []
+    for item in data:
+        value = item.get(key) if type(item) is dict else None
+        if type(value) is not int and type(value) is not float:
+            return None
+        values.append(value)
+    return reduce(values)
+
+
+# Parsed snippets by source; parsing can cost more than running short code.
+# Shared by the worker threads, hence the lock.
+_monty_cache: LRUCache = LRUCache(maxsize=256)
+_monty_lock = threading.Lock()
+
+
+def _get_monty(code: str) -> pydantic_monty.Monty:
+    """Returns a parsed Monty program for the code, reusing earlier parses."""
+    with _monty_lock:
+        m = _monty_cache.get(code)
+    if m is None:
+        # Initialize Monty with the code and expected input variables
+        # Using strict limits by default for safety
+        m = pydantic_monty.Monty(code, inputs=["data"])
+        with _monty_lock:
+            _monty_cache[code] = m
+    return m
 
 
 def analyze_data(code: str, data: Any) -> Any:
@@ -11,14 +133,16 @@ def analyze_data(code: str, data: Any) -> Any:
         data: The data structure (dict, list, etc.) to inject as the 'data' variable.
     """
 
+    # Common column reductions don't need an interpreter at all
+    result = _reduce_natively(code, data)
+    if result is not None:
+        return result
+
     # Always inject data as 'data' variable
     inputs = {"data": data}
-    input_names = ["data"]
 
     try:
-        # Initialize Monty with the code and expected input variables
-        # Using strict limits by default for safety
-        m = pydantic_monty.Monty(code, inputs=input_names)
+        m = _get_monty(code)
 
         # Execute the code
         result = m.run(inputs=inputs)
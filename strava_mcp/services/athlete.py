@@ -1,36 +1,93 @@
 """Athlete-related services for Strava MCP Server."""
 
-from stravalib.client import Client
+import asyncio
+from typing import Optional
+import msgspec
+from strava_mcp.cache import cached
+from strava_mcp.config import ATHLETE_TTL, ATHLETE_STATS_TTL
+from strava_mcp.http import StravaClient
 from strava_mcp.models import AthleteStats, ActivityTotals
 
 
-def get_athlete_stats(client: Client) -> AthleteStats:
-    """Get statistics for the authenticated athlete."""
-    athlete = client.get_athlete()
-    stats = client.get_athlete_stats(athlete.id)
+class _RawAthlete(msgspec.Struct):
+    """The fields read from Strava's /athlete response."""
 
-    def get_val(obj, attr, default=None):
-        val = getattr(obj, attr, default) if obj else default
-        if val is None:
-            return default
-        return val
+    id: int
+    firstname: Optional[str] = None
+    lastname: Optional[str] = None
 
-    recent_run = stats.recent_run_totals
-    all_run = stats.all_run_totals
-    recent_ride = stats.recent_ride_totals
+
+class _RawTotals(msgspec.Struct):
+    """The fields read from an activity totals object."""
+
+    distance: Optional[float] = None
+    achievement_count: Optional[int] = None
+    elevation_gain: Optional[float] = None
+
+
+class _RawStats(msgspec.Struct):
+    """The fields read from Strava's /athletes/{id}/stats response."""
+
+    recent_run_totals: Optional[_RawTotals] = None
+    all_run_totals: Optional[_RawTotals] = None
+    recent_ride_totals: Optional[_RawTotals] = None
+
+
+# Stand-in for totals Strava omits, so fields can be read without None checks
+_NO_TOTALS = _RawTotals()
+
+_athlete_decoder = msgspec.json.Decoder(_RawAthlete)
+_stats_decoder = msgspec.json.Decoder(_RawStats)
+
+
+@cached(ttl=ATHLETE_TTL)
+async def _get_athlete(client: StravaClient) -> _RawAthlete:
+    """Get the authenticated athlete's id and name."""
+    return await client.get("/athlete", decoder=_athlete_decoder)
+
+
+@cached(ttl=ATHLETE_STATS_TTL)
+async def _get_stats(client: StravaClient, athlete_id: int) -> _RawStats:
+    """Get the activity totals of an athlete."""
+    return await client.get(f"/athletes/{athlete_id}/stats", decoder=_stats_decoder)
+
+
+async def get_athlete_stats(
+    client: StravaClient, force_refresh: bool = False
+) -> AthleteStats:
+    """
+    Get statistics for the authenticated athlete.
+
+    Args:
+        force_refresh: Bypass the cached profile and stats
+    """
+    if client.athlete_id is None:
+        # First call: the stats endpoint needs the athlete id
+        athlete = await _get_athlete(client, force_refresh=force_refresh)
+        client.athlete_id = athlete.id
+        stats = await _get_stats(client, client.athlete_id, force_refresh=force_refresh)
+    else:
+        athlete, stats = await asyncio.gather(
+            _get_athlete(client, force_refresh=force_refresh),
+            _get_stats(client, client.athlete_id, force_refresh=force_refresh),
+        )
+
+    recent_run = stats.recent_run_totals or _NO_TOTALS
+    all_run = stats.all_run_totals or _NO_TOTALS
+    recent_ride = stats.recent_ride_totals or _NO_TOTALS
 
     return AthleteStats(
-        firstname=getattr(athlete, "firstname", ""),
-        lastname=getattr(athlete, "lastname", ""),
+        firstname=athlete.firstname or "",
+        lastname=athlete.lastname or "",
         recent_run_totals=ActivityTotals(
-            distance=float(get_val(recent_run, "distance", 0.0)),
-            achievement_count=int(get_val(recent_run, "achievement_count", 0)),
+            distance=float(recent_run.distance or 0.0),
+            achievement_count=int(recent_run.achievement_count or 0),
         ),
         all_run_totals=ActivityTotals(
-            distance=float(get_val(all_run, "distance", 0.0)),
+            distance=float(all_run.distance or 0.0),
         ),
         recent_ride_totals=ActivityTotals(
-            distance=float(get_val(recent_ride, "distance", 0.0)),
-            elevation_gain=float(get_val(recent_ride, "elevation_gain", 0.0)),
+            distance=float(recent_ride.distance or 0.0),
+            elevation_gain=float(recent_ride.elevation_gain or 0.0),
         ),
     )
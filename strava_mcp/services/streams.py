@@ -1,74 +1,133 @@
 """Streams and laps services for Strava MCP Server."""
 
 from typing import Literal, Optional
-from stravalib.client import Client
-from strava_mcp.models import LapSummary, ActivityStreams
+import msgspec
+from strava_mcp.cache import cached_by_activity
+from strava_mcp.config import ACTIVITY_DATA_TTL, STREAMS_CACHE_BYTES
+from strava_mcp.http import StravaClient
+from strava_mcp.models import LapSummary, ActivityStreams, pack_stream
 
+# All stream types exposed by ActivityStreams, requested when no types are given
+STREAM_TYPES = [
+    "time",
+    "latlng",
+    "distance",
+    "altitude",
+    "velocity_smooth",
+    "heartrate",
+    "cadence",
+    "watts",
+    "temp",
+    "moving",
+    "grade_smooth",
+]
+_STREAM_FIELDS = frozenset(STREAM_TYPES)
 
-def get_activity_laps(client: Client, activity_id: int) -> list[LapSummary]:
-    """Get lap breakdowns for a specific activity."""
-    laps = client.get_activity_laps(activity_id)
 
-    result = []
-    for lap in laps:
-        moving_time = getattr(lap.moving_time, "seconds", 0) if lap.moving_time else 0
-        elapsed_time = (
-            getattr(lap.elapsed_time, "seconds", 0) if lap.elapsed_time else 0
-        )
+class _RawMeta(msgspec.Struct):
+    """A reference to another Strava object, e.g. a lap's parent activity."""
 
-        summary = LapSummary(
-            id=lap.id or 0,
-            activity_id=getattr(lap, "activity_id", 0) or 0,
-            lap_index=getattr(lap, "lap_index", 0),
-            name=lap.name or "",
-            elapsed_time=elapsed_time,
-            moving_time=moving_time,
-            distance=float(lap.distance) if lap.distance else 0.0,
-            average_speed=float(lap.average_speed) if lap.average_speed else 0.0,
-            max_speed=float(lap.max_speed) if lap.max_speed else 0.0,
-            average_cadence=float(lap.average_cadence) if lap.average_cadence else None,
-            average_watts=float(lap.average_watts) if lap.average_watts else None,
-            average_heartrate=float(lap.average_heartrate)
-            if lap.average_heartrate
-            else None,
-            max_heartrate=float(lap.max_heartrate) if lap.max_heartrate else None,
-            total_elevation_gain=float(lap.total_elevation_gain)
-            if lap.total_elevation_gain
-            else 0.0,
-        )
-        result.append(summary)
-    return result
+    id: Optional[int] = None
+
+
+class _RawLap(msgspec.Struct):
+    """The fields read from a Strava lap; all others are skipped."""
+
+    id: Optional[int] = None
+    activity: Optional[_RawMeta] = None
+    lap_index: Optional[int] = None
+    name: Optional[str] = None
+    elapsed_time: Optional[int] = None
+    moving_time: Optional[int] = None
+    distance: Optional[float] = None
+    average_speed: Optional[float] = None
+    max_speed: Optional[float] = None
+    average_cadence: Optional[float] = None
+    average_watts: Optional[float] = None
+    average_heartrate: Optional[float] = None
+    max_heartrate: Optional[float] = None
+    total_elevation_gain: Optional[float] = None
+
+
+class _RawStream(msgspec.Struct):
+    """A single stream; only the samples are read."""
+
+    data: Optional[list] = None
+
+
+_laps_decoder = msgspec.json.Decoder(list[_RawLap])
+_streams_decoder = msgspec.json.Decoder(dict[str, _RawStream])
 
 
-def get_activity_streams(
-    client: Client,
+def _to_lap(lap: _RawLap) -> LapSummary:
+    """
+    Build a LapSummary from a raw Strava lap.
+    Zero averages (e.g. no power meter) become None.
+    """
+    return LapSummary(
+        id=lap.id or 0,
+        activity_id=(lap.activity.id if lap.activity else None) or 0,
+        lap_index=lap.lap_index or 0,
+        name=lap.name or "",
+        elapsed_time=lap.elapsed_time or 0,
+        moving_time=lap.moving_time or 0,
+        distance=lap.distance or 0.0,
+        average_speed=lap.average_speed or 0.0,
+        max_speed=lap.max_speed or 0.0,
+        average_cadence=lap.average_cadence or None,
+        average_watts=lap.average_watts or None,
+        average_heartrate=lap.average_heartrate or None,
+        max_heartrate=lap.max_heartrate or None,
+        total_elevation_gain=lap.total_elevation_gain or 0.0,
+    )
+
+
+@cached_by_activity(ttl=ACTIVITY_DATA_TTL)
+async def get_activity_laps(client: StravaClient, activity_id: int) -> list[LapSummary]:
+    """Get lap breakdowns for a specific activity."""
+    laps = await client.get(f"/activities/{activity_id}/laps", decoder=_laps_decoder)
+
+    return [_to_lap(lap) for lap in laps]
+
+
+@cached_by_activity(
+    ttl=ACTIVITY_DATA_TTL,
+    maxsize=STREAMS_CACHE_BYTES,
+    getsizeof=ActivityStreams.nbytes,
+)
+async def get_activity_streams(
+    client: StravaClient,
     activity_id: int,
     types: Optional[list[str]] = None,
     resolution: Optional[Literal["low", "medium", "high"]] = None,
 ) -> ActivityStreams:
-    """Get raw stream data (GPS, HR, power, etc.) for a specific activity."""
-    streams = client.get_activity_streams(
-        activity_id, types=types, resolution=resolution
-    )
+    """
+    Get raw stream data (GPS, HR, power, etc.) for a specific activity.
+    Only the requested types are populated; Strava also sends the activity's
+    series type (e.g. distance), which is dropped unless requested.
+    """
+    params = {"keys": ",".join(types or STREAM_TYPES), "key_by_type": "true"}
+    wanted = _STREAM_FIELDS.intersection(types) if types else _STREAM_FIELDS
+    if resolution:
+        params["resolution"] = resolution
 
-    # Extract data from each stream type if available
-    # Each stream is a Stream object with a .data attribute
-    def get_stream_data(key: str) -> Optional[list]:
-        if key in streams:
-            stream = streams[key]
-            return getattr(stream, "data", None)
-        return None
-
-    return ActivityStreams(
-        time=get_stream_data("time"),
-        latlng=get_stream_data("latlng"),
-        distance=get_stream_data("distance"),
-        altitude=get_stream_data("altitude"),
-        velocity_smooth=get_stream_data("velocity_smooth"),
-        heartrate=get_stream_data("heartrate"),
-        cadence=get_stream_data("cadence"),
-        watts=get_stream_data("watts"),
-        temp=get_stream_data("temp"),
-        moving=get_stream_data("moving"),
-        grade_smooth=get_stream_data("grade_smooth"),
+    # Copied since the decoded response may be shared with concurrent callers
+    streams = dict(
+        await client.get(
+            f"/activities/{activity_id}/streams",
+            params=params,
+            decoder=_streams_decoder,
+        )
     )
+
+    # Each stream is keyed by type and carries its samples under "data";
+    # samples are packed into typed arrays since results stay cached. One pass
+    # pops each stream, freeing its decoded list as soon as it has been packed,
+    # so the lists and arrays of a high-resolution response never all coexist.
+    packed = {}
+    while streams:
+        key, stream = streams.popitem()
+        if key in wanted:
+            packed[key] = pack_stream(key, stream.data)
+
+    return ActivityStreams(**packed)
@@ -0,0 +1,11 @@
+import pytest
+
+from strava_mcp import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Keep cached service results from leaking between tests."""
+    cache.clear()
+    yield
+    cache.clear()
@@ -1,5 +1,6 @@
+import pydantic_monty
 import pytest
-from strava_mcp.services.analysis import analyze_data
+from strava_mcp.services.analysis import _get_monty, analyze_data
 
 
 def test_analyze_simple_math():
@@ -30,3 +31,34 @@ def test_analyze_with_invalid_code():
     # depending on how we implement the service. For now, let's assume it raises.
     with pytest.raises(Exception):
         analyze_data(code, data)
+
+
+def test_analyze_reductions_match_monty():
+    """Test that natively computed reductions agree with the sandbox."""
+    data = [{"distance": 1000}, {"distance": 2500.5}, {"distance": 500}]
+    for code in (
+        "sum(item['distance'] for item in data)",
+        "max(a['distance'] for a in data)",
+        "min(a['distance'] for a in data)",
+    ):
+        expected = pydantic_monty.Monty(code, inputs=["data"]).run(
+            inputs={"data": data}
+        )
+        assert analyze_data(code, data) == expected
+
+
+def test_analyze_reduction_falls_back_on_unusual_data():
+    """Test that missing keys still surface Monty's error."""
+    with pytest.raises(RuntimeError, match="Analysis failed"):
+        analyze_data("sum(a['distance'] for a in data)", [{"id": 1}])
+
+    assert analyze_data("max(a['x'] for a in data)", [{"x": "b"}, {"x": "a"}]) == "b"
+
+
+def test_analyze_reuses_parsed_code():
+    """Test that the same snippet runs against new data without reparsing."""
+    code = "len([a for a in data if a > 1])"
+    assert analyze_data(code, [1, 2, 3]) == 2
+    m = _get_monty(code)
+    assert analyze_data(code, [5, 6]) == 2
+    assert _get_monty(code) is m
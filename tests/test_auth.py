@@ -0,0 +1,97 @@
+import asyncio
+import json
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from strava_mcp import auth
+
+
+@pytest.fixture
+def token_endpoint(monkeypatch, tmp_path):
+    """Mock the OAuth token endpoint and isolate the module token state."""
+    payloads = iter(
+        {
+            "access_token": f"access-{i}",
+            "refresh_token": f"refresh-{i}",
+            "expires_at": int(time.time()) + 3600,
+        }
+        for i in range(1, 10)
+    )
+
+    async def post(url, data):
+        await asyncio.sleep(0)  # let concurrent callers queue up
+        response = MagicMock()
+        response.json.return_value = next(payloads)
+        return response
+
+    http = MagicMock()
+    http.post = AsyncMock(side_effect=post)
+    monkeypatch.setattr(auth, "get_http_client", lambda: http)
+    monkeypatch.setattr(auth, "TOKEN_CACHE_PATH", str(tmp_path / "token.json"))
+    monkeypatch.setattr(auth, "_access_token", "")
+    monkeypatch.setattr(auth, "_refresh_token", "refresh-0")
+    monkeypatch.setattr(auth, "_token_expires_at", 0)
+    monkeypatch.setattr(auth, "_refresh_lock", asyncio.Lock())
+    return http
+
+
+def test_concurrent_callers_share_one_refresh(token_endpoint):
+    async def fetch_many():
+        return await asyncio.gather(*(auth.get_access_token() for _ in range(5)))
+
+    tokens = asyncio.run(fetch_many())
+
+    assert tokens == ["access-1"] * 5
+    token_endpoint.post.assert_called_once()
+
+
+def test_valid_token_skips_refresh(token_endpoint):
+    asyncio.run(auth.get_access_token())
+    asyncio.run(auth.get_access_token())
+
+    token_endpoint.post.assert_called_once()
+
+
+def test_refreshed_token_is_persisted_and_reloaded(token_endpoint, monkeypatch):
+    asyncio.run(auth.get_access_token())
+
+    with open(auth.TOKEN_CACHE_PATH) as f:
+        saved = json.load(f)
+    assert saved["access_token"] == "access-1"
+    assert saved["refresh_token"] == "refresh-1"
+
+    # Simulate a restart: the persisted token is reused without a refresh
+    monkeypatch.setattr(auth, "_access_token", "")
+    monkeypatch.setattr(auth, "_token_expires_at", 0)
+    auth._load_token()
+
+    assert asyncio.run(auth.get_access_token()) == "access-1"
+    token_endpoint.post.assert_called_once()
+
+
+def test_persisted_token_ignored_after_env_token_changes(token_endpoint, monkeypatch):
+    asyncio.run(auth.get_access_token())
+
+    # Simulate a restart with a new STRAVA_REFRESH_TOKEN in the environment
+    monkeypatch.setattr(auth, "REFRESH_TOKEN", "refresh-new")
+    monkeypatch.setattr(auth, "_access_token", "")
+    monkeypatch.setattr(auth, "_refresh_token", "refresh-new")
+    monkeypatch.setattr(auth, "_token_expires_at", 0)
+    auth._load_token()
+
+    assert auth._refresh_token == "refresh-new"
+    assert asyncio.run(auth.get_access_token()) == "access-2"
+    assert token_endpoint.post.call_args.kwargs["data"]["refresh_token"] == (
+        "refresh-new"
+    )
+
+
+def test_force_refresh_bypasses_expiry(token_endpoint):
+    asyncio.run(auth.get_access_token())
+    token = asyncio.run(auth.force_refresh())
+
+    assert token == "access-2"
+    assert token_endpoint.post.call_count == 2
+    assert token_endpoint.post.call_args.kwargs["data"]["refresh_token"] == "refresh-1"
@@ -0,0 +1,98 @@
+import asyncio
+
+from unittest.mock import AsyncMock, MagicMock
+
+from strava_mcp.cache import cached, cached_by_activity, invalidate
+
+
+def test_cached_by_activity_serves_repeat_calls_from_cache():
+    """Test that identical arguments only hit the wrapped function once."""
+    fetch = AsyncMock(return_value="result")
+
+    @cached_by_activity(ttl=60)
+    async def service(client, activity_id, types=None):
+        return await fetch(activity_id, types)
+
+    client = MagicMock()
+    assert asyncio.run(service(client, 1, ["time"])) == "result"
+    assert asyncio.run(service(client, 1, types=["time"])) == "result"
+    fetch.assert_called_once_with(1, ["time"])
+
+    # Different arguments are cached separately
+    asyncio.run(service(client, 1, ["heartrate"]))
+    asyncio.run(service(client, 2, ["time"]))
+    assert fetch.call_count == 3
+
+
+def test_invalidate_drops_entries_for_activity():
+    """Test that invalidate() forces the next call back to the API."""
+    fetch = AsyncMock(return_value="result")
+
+    @cached_by_activity(ttl=60)
+    async def service(client, activity_id):
+        return await fetch(activity_id)
+
+    client = MagicMock()
+    asyncio.run(service(client, 1))
+    asyncio.run(service(client, 2))
+    invalidate(1)
+    asyncio.run(service(client, 1))
+    asyncio.run(service(client, 2))
+
+    assert [c.args[0] for c in fetch.call_args_list] == [1, 2, 1]
+
+
+def test_cached_counts_hits_and_force_refresh_bypasses():
+    """Test that cache_info() counts hits/misses and force_refresh skips the cache."""
+    fetch = AsyncMock(side_effect=["first", "second"])
+
+    @cached(ttl=60)
+    async def service(client):
+        return await fetch()
+
+    client = MagicMock()
+    assert asyncio.run(service(client)) == "first"
+    assert asyncio.run(service(client)) == "first"
+    assert asyncio.run(service(client, force_refresh=True)) == "second"
+    assert asyncio.run(service(client)) == "second"
+
+    info = service.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 1)
+
+
+def test_concurrent_misses_share_one_call():
+    """Test that concurrent calls for the same key run the function once."""
+    calls = []
+
+    @cached_by_activity(ttl=60)
+    async def service(client, activity_id):
+        calls.append(activity_id)
+        await asyncio.sleep(0)
+        return activity_id * 10
+
+    async def fetch_many():
+        client = MagicMock()
+        return await asyncio.gather(
+            service(client, 1), service(client, 1), service(client, 2)
+        )
+
+    assert asyncio.run(fetch_many()) == [10, 10, 20]
+    assert sorted(calls) == [1, 2]
+    assert service.cache_info().misses == 2
+
+
+def test_cached_by_activity_bounds_by_size():
+    """Test that getsizeof caps total size and oversized results aren't stored."""
+    fetch = AsyncMock(side_effect=lambda activity_id: "x" * activity_id)
+
+    @cached_by_activity(ttl=60, maxsize=10, getsizeof=len)
+    async def service(client, activity_id):
+        return await fetch(activity_id)
+
+    client = MagicMock()
+    for activity_id in (4, 4, 5, 20, 20, 6):
+        assert asyncio.run(service(client, activity_id)) == "x" * activity_id
+
+    # 20 never fits, and storing 6 evicts 4 and 5 to stay within 10
+    assert [c.args[0] for c in fetch.call_args_list] == [4, 5, 20, 20, 6]
+    assert service.cache_info().currsize == 6
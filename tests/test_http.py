@@ -0,0 +1,275 @@
+import asyncio
+
+import httpx
+import msgspec
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from strava_mcp.http import StravaClient, seconds_until_next_quarter_hour
+from strava_mcp.services.activities import list_activities
+
+
+def make_client(handler) -> StravaClient:
+    transport = httpx.MockTransport(handler)
+    http = httpx.AsyncClient(base_url="https://strava.test/api/v3", transport=transport)
+    return StravaClient(AsyncMock(return_value="token-123"), http=http)
+
+
+def test_get_sends_bearer_token_and_params():
+    """Test that requests carry the access token and query params."""
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["path"] = request.url.path
+        seen["params"] = dict(request.url.params)
+        seen["auth"] = request.headers["Authorization"]
+        return httpx.Response(200, json=[{"id": 1}])
+
+    client = make_client(handler)
+    result = asyncio.run(client.get("/athlete/activities", params={"per_page": 5}))
+
+    assert result == [{"id": 1}]
+    assert seen["path"] == "/api/v3/athlete/activities"
+    assert seen["params"] == {"per_page": "5"}
+    assert seen["auth"] == "Bearer token-123"
+
+
+def test_get_raises_generic_error_on_failure():
+    """Test that API errors are surfaced without the response body."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, json={"message": "Record Not Found"})
+
+    client = make_client(handler)
+
+    with pytest.raises(RuntimeError, match="status 404"):
+        asyncio.run(client.get("/activities/1"))
+
+
+def test_get_wraps_connection_errors():
+    """Test that transport failures surface as a generic RuntimeError."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = make_client(handler)
+
+    with pytest.raises(RuntimeError, match="request failed"):
+        asyncio.run(client.get("/activities/1"))
+
+
+def test_list_activities_serves_stale_result_on_connection_error():
+    """Test that a connection failure falls back to the last activity list."""
+
+    online = True
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if not online:
+            raise httpx.ConnectError("connection refused", request=request)
+        activity = {"id": 1, "name": "Run", "type": "Run", "distance": 5000.0}
+        return httpx.Response(200, json=[activity])
+
+    client = make_client(handler)
+    first = asyncio.run(list_activities(client, limit=5))
+
+    online = False
+    assert asyncio.run(list_activities(client, limit=5, force_refresh=True)) == first
+
+
+def test_get_refreshes_token_once_on_401():
+    """Test that a 401 triggers a forced refresh and a single retry."""
+    tokens = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        tokens.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == "Bearer token-123":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"id": 1})
+
+    transport = httpx.MockTransport(handler)
+    http = httpx.AsyncClient(base_url="https://strava.test/api/v3", transport=transport)
+    on_unauthorized = AsyncMock(return_value="token-456")
+    client = StravaClient(
+        AsyncMock(return_value="token-123"), http=http, on_unauthorized=on_unauthorized
+    )
+
+    assert asyncio.run(client.get("/athlete")) == {"id": 1}
+    assert tokens == ["Bearer token-123", "Bearer token-456"]
+    on_unauthorized.assert_awaited_once()
+
+
+def test_seconds_until_next_quarter_hour():
+    assert seconds_until_next_quarter_hour(0) == 900
+    assert seconds_until_next_quarter_hour(14 * 60 + 30) == 30
+    assert seconds_until_next_quarter_hour(15 * 60 + 1) == 899
+
+
+def test_get_tracks_rate_limit_headers():
+    """Test that usage is parsed, preferring the read-specific headers."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {
+            "X-RateLimit-Limit": "200,2000",
+            "X-RateLimit-Usage": "10,500",
+            "X-ReadRateLimit-Limit": "100,1000",
+            "X-ReadRateLimit-Usage": "5,250",
+        }
+        return httpx.Response(200, json={}, headers=headers)
+
+    client = make_client(handler)
+    asyncio.run(client.get("/athlete"))
+
+    assert client.rate_limit.short_usage == 5
+    assert client.rate_limit.short_limit == 100
+    assert client.rate_limit.long_usage == 250
+    assert client.rate_limit.long_limit == 1000
+
+
+@patch("strava_mcp.http.asyncio.sleep", new_callable=AsyncMock)
+def test_get_waits_and_retries_on_429(mock_sleep):
+    """Test that a 429 waits for the next window instead of retrying at once."""
+    responses = iter([httpx.Response(429), httpx.Response(200, json={"id": 1})])
+    client = make_client(lambda request: next(responses))
+
+    with patch("strava_mcp.http.time.time", return_value=600):
+        assert asyncio.run(client.get("/athlete")) == {"id": 1}
+
+    mock_sleep.assert_awaited_once_with(301)
+
+
+@patch("strava_mcp.http.asyncio.sleep", new_callable=AsyncMock)
+def test_get_gives_up_after_repeated_429(mock_sleep):
+    client = make_client(lambda request: httpx.Response(429))
+
+    with pytest.raises(RuntimeError, match="rate limit"):
+        asyncio.run(client.get("/athlete"))
+
+    assert mock_sleep.await_count == 3
+
+
+@patch("strava_mcp.http.asyncio.sleep", new_callable=AsyncMock)
+def test_get_does_not_wait_when_daily_limit_exhausted(mock_sleep):
+    headers = {"X-RateLimit-Limit": "100,1000", "X-RateLimit-Usage": "100,1000"}
+    client = make_client(lambda request: httpx.Response(429, headers=headers))
+
+    with pytest.raises(RuntimeError, match="rate limit"):
+        asyncio.run(client.get("/athlete"))
+
+    mock_sleep.assert_not_awaited()
+
+
+@patch("strava_mcp.http.asyncio.sleep", new_callable=AsyncMock)
+def test_get_pauses_when_near_short_limit(mock_sleep):
+    client = make_client(lambda request: httpx.Response(200, json={}))
+    client.rate_limit.short_usage = 99
+    client.rate_limit.short_limit = 100
+    client.rate_limit.window = 0
+
+    with patch("strava_mcp.http.time.time", return_value=0):
+        asyncio.run(client.get("/athlete"))
+
+    mock_sleep.assert_awaited_once_with(900)
+
+
+@patch("strava_mcp.http.asyncio.sleep", new_callable=AsyncMock)
+def test_near_limit_usage_expires_with_its_window(mock_sleep):
+    """Test that usage recorded in an earlier window doesn't delay requests."""
+    headers = {"X-RateLimit-Limit": "100,1000", "X-RateLimit-Usage": "96,200"}
+    client = make_client(lambda request: httpx.Response(200, json={}, headers=headers))
+
+    with patch("strava_mcp.http.time.time", return_value=14 * 60):
+        asyncio.run(client.get("/athlete"))
+        assert client.rate_limit.near_short_limit()
+
+    # Two windows later the quota has reset, so no wait is needed
+    with patch("strava_mcp.http.time.time", return_value=40 * 60):
+        assert not client.rate_limit.near_short_limit()
+        asyncio.run(client.get("/athlete"))
+
+    mock_sleep.assert_not_awaited()
+
+
+def test_get_decodes_with_typed_decoder():
+    """Test that a typed decoder is used and mismatched bodies fail generically."""
+
+    class Athlete(msgspec.Struct):
+        id: int
+
+    decoder = msgspec.json.Decoder(Athlete)
+    bodies = iter([{"id": 1, "firstname": "Test"}, {"id": "not-an-int"}])
+    client = make_client(lambda request: httpx.Response(200, json=next(bodies)))
+
+    assert asyncio.run(client.get("/athlete", decoder=decoder)) == Athlete(id=1)
+
+    with pytest.raises(RuntimeError, match="unexpected response"):
+        asyncio.run(client.get("/athlete", decoder=decoder))
+
+
+def test_conditional_get_reuses_body_on_304():
+    """Test that a repeated conditional GET revalidates with the cached ETag."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[{"id": 1}], headers={"ETag": '"v1"'})
+
+    client = make_client(handler)
+    params = {"per_page": 5, "page": 1}
+    first = asyncio.run(client.get("/athlete/activities", params, conditional=True))
+    second = asyncio.run(client.get("/athlete/activities", params, conditional=True))
+
+    assert first == second == [{"id": 1}]
+    assert seen == [None, '"v1"']
+
+    # Other params, and non-conditional requests, don't send the ETag
+    asyncio.run(client.get("/athlete/activities", {"per_page": 5, "page": 2}))
+    asyncio.run(client.get("/athlete/activities", params))
+    assert seen[2:] == [None, None]
+
+
+def test_etag_cache_is_bounded_by_body_size():
+    """Test that bodies larger than the ETag cache are served but not stored."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        return httpx.Response(200, json=[0] * 100, headers={"ETag": '"v1"'})
+
+    with patch("strava_mcp.http.ETAG_CACHE_BYTES", 64):
+        client = make_client(handler)
+    for _ in range(2):
+        result = asyncio.run(client.get("/athlete/activities", conditional=True))
+        assert result == [0] * 100
+
+    assert seen == [None, None]
+    assert client._etag_cache.currsize == 0
+
+
+def test_concurrent_identical_gets_share_one_request():
+    """Test that identical in-flight requests are coalesced into one API call."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"id": 1})
+
+    client = make_client(handler)
+
+    async def fetch_many():
+        return await asyncio.gather(
+            client.get("/activities/1"),
+            client.get("/activities/1"),
+            client.get("/activities/2"),
+        )
+
+    results = asyncio.run(fetch_many())
+
+    assert results == [{"id": 1}] * 3
+    assert sorted(calls) == ["/api/v3/activities/1", "/api/v3/activities/2"]
+    assert client._inflight == {}
+
+    # Once finished, the next identical request goes to the API again
+    asyncio.run(client.get("/activities/1"))
+    assert len(calls) == 3
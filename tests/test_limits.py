@@ -1,10 +1,18 @@
+import asyncio
+
 import pytest
-from unittest.mock import patch, MagicMock
-from server import list_activities_tool, search_activities_tool, MAX_LIMIT
+from unittest.mock import AsyncMock, patch, MagicMock
+from server import (
+    get_activities_details_tool,
+    list_activities_tool,
+    search_activities_tool,
+    MAX_LIMIT,
+)
+from strava_mcp.models import ActivityError
 
 
 @patch("server.get_client")
-@patch("server.list_activities")
+@patch("server.list_activities", new_callable=AsyncMock)
 def test_list_activities_tool_limit_clamping(mock_list_activities, mock_get_client):
     # Setup
     mock_client = MagicMock()
@@ -13,7 +21,7 @@ def test_list_activities_tool_limit_clamping(mock_list_activities, mock_get_clie
 
     # Test with limit > MAX_LIMIT
     excessive_limit = MAX_LIMIT + 100
-    list_activities_tool.fn(limit=excessive_limit)
+    asyncio.run(list_activities_tool.fn(limit=excessive_limit))
 
     # Verify list_activities was called with MAX_LIMIT
     mock_list_activities.assert_called_once_with(mock_client, MAX_LIMIT)
@@ -23,7 +31,7 @@ def test_list_activities_tool_limit_clamping(mock_list_activities, mock_get_clie
 
 
 @patch("server.get_client")
-@patch("server.list_activities")
+@patch("server.list_activities", new_callable=AsyncMock)
 def test_list_activities_tool_normal_limit(mock_list_activities, mock_get_client):
     # Setup
     mock_client = MagicMock()
@@ -32,14 +40,14 @@ def test_list_activities_tool_normal_limit(mock_list_activities, mock_get_client
 
     # Test with normal limit
     normal_limit = 10
-    list_activities_tool.fn(limit=normal_limit)
+    asyncio.run(list_activities_tool.fn(limit=normal_limit))
 
     # Verify list_activities was called with normal_limit
     mock_list_activities.assert_called_once_with(mock_client, normal_limit)
 
 
 @patch("server.get_client")
-@patch("server.search_activities")
+@patch("server.search_activities", new_callable=AsyncMock)
 def test_search_activities_tool_limit_clamping(mock_search_activities, mock_get_client):
     # Setup
     mock_client = MagicMock()
@@ -48,9 +56,49 @@ def test_search_activities_tool_limit_clamping(mock_search_activities, mock_get_
 
     # Test with limit > MAX_LIMIT
     excessive_limit = MAX_LIMIT + 100
-    search_activities_tool.fn(limit=excessive_limit)
+    asyncio.run(search_activities_tool.fn(limit=excessive_limit))
 
     # Verify search_activities was called with MAX_LIMIT (among other args)
     # Check that limit=MAX_LIMIT is in kwargs or args
     call_args = mock_search_activities.call_args
     assert call_args.kwargs["limit"] == MAX_LIMIT
+
+
+@patch("server.get_client")
+@patch("server.get_activity_details", new_callable=AsyncMock)
+def test_get_activities_details_tool_rejects_oversized_batches(
+    mock_details, mock_get_client
+):
+    mock_details.side_effect = lambda client, activity_id: {"id": activity_id}
+
+    # Results keep the requested order, up to MAX_LIMIT per call
+    result = asyncio.run(
+        get_activities_details_tool.fn(activity_ids=list(range(MAX_LIMIT)))
+    )
+    assert [r["id"] for r in result] == list(range(MAX_LIMIT))
+
+    # Larger batches fail outright rather than silently dropping IDs
+    with pytest.raises(ValueError, match=str(MAX_LIMIT)):
+        asyncio.run(
+            get_activities_details_tool.fn(activity_ids=list(range(MAX_LIMIT + 1)))
+        )
+    assert mock_details.call_count == MAX_LIMIT
+
+
+@patch("server.get_client")
+@patch("server.get_activity_details", new_callable=AsyncMock)
+def test_get_activities_details_tool_reports_failed_ids(mock_details, mock_get_client):
+    async def details(client, activity_id):
+        if activity_id == 2:
+            raise RuntimeError("Strava API request failed with status 404.")
+        return {"id": activity_id}
+
+    mock_details.side_effect = details
+
+    result = asyncio.run(get_activities_details_tool.fn(activity_ids=[1, 2, 3]))
+
+    assert result == [
+        {"id": 1},
+        ActivityError(id=2, error="Strava API request failed with status 404."),
+        {"id": 3},
+    ]
@@ -1,14 +1,22 @@
 """Tests for Strava MCP Server."""
 
+import asyncio
+import base64
+import dataclasses
+import struct
+from array import array
+
+import msgspec
 import pytest
-from unittest.mock import MagicMock
-import datetime
+from unittest.mock import AsyncMock, MagicMock
 from strava_mcp.models import (
     AthleteStats,
     ActivitySummary,
     ActivityDetails,
     LapSummary,
     ActivityStreams,
+    pack_stream,
+    unpack_stream,
 )
 from strava_mcp.services.athlete import get_athlete_stats
 from strava_mcp.services.activities import (
@@ -17,76 +25,90 @@ from strava_mcp.services.activities import (
     get_activity_details,
 )
 from strava_mcp.services.streams import get_activity_laps, get_activity_streams
+from server import serialize_tool_result
+
+# Mock payloads to simulate Strava API JSON responses
+
+
+def mock_athlete() -> dict:
+    return {"id": 123, "firstname": "Test", "lastname": "Athlete"}
 
-# Mock objects to simulate Strava API responses
-
-
-class MockAthlete:
-    def __init__(self):
-        self.id = 123
-        self.firstname = "Test"
-        self.lastname = "Athlete"
-
-
-class MockStats:
-    def __init__(self):
-        self.recent_run_totals = MagicMock(distance=1000.0, achievement_count=5)
-        self.all_run_totals = MagicMock(distance=50000.0)
-        self.recent_ride_totals = MagicMock(distance=2000.0, elevation_gain=100.0)
-
-
-class MockActivity:
-    def __init__(self, id=1, name="Run", type="Run"):
-        self.id = id
-        self.name = name
-        self.type = type
-        self.start_date = datetime.datetime(2023, 1, 1, 12, 0, 0)
-        self.distance = 5000.0
-        self.moving_time = datetime.timedelta(seconds=1800)
-        self.elapsed_time = datetime.timedelta(seconds=2000)
-        self.total_elevation_gain = 50.0
-        self.average_speed = 2.8
-        self.max_speed = 3.5
-        self.calories = 300
-        self.device_name = "Garmin"
-        self.description = "Nice run"
-
-
-class MockLap:
-    def __init__(self, id=1, name="Lap 1"):
-        self.id = id
-        self.activity_id = 123
-        self.lap_index = id
-        self.name = name
-        self.elapsed_time = datetime.timedelta(seconds=600)
-        self.moving_time = datetime.timedelta(seconds=580)
-        self.distance = 1000.0
-        self.average_speed = 2.5
-        self.max_speed = 3.0
-        self.average_cadence = 85.0
-        self.average_watts = None
-        self.average_heartrate = 145.0
-        self.max_heartrate = 165.0
-        self.total_elevation_gain = 50.0
-
-
-class MockStream:
-    def __init__(self, data):
-        self.data = data
+
+def mock_stats() -> dict:
+    return {
+        "recent_run_totals": {"distance": 1000.0, "achievement_count": 5},
+        "all_run_totals": {"distance": 50000.0},
+        "recent_ride_totals": {"distance": 2000.0, "elevation_gain": 100.0},
+    }
+
+
+def mock_activity(id=1, name="Run", type="Run") -> dict:
+    return {
+        "id": id,
+        "name": name,
+        "type": type,
+        "start_date": "2023-01-01T12:00:00Z",
+        "distance": 5000.0,
+        "moving_time": 1800,
+        "elapsed_time": 2000,
+        "total_elevation_gain": 50.0,
+        "average_speed": 2.8,
+        "max_speed": 3.5,
+        "calories": 300,
+        "device_name": "Garmin",
+        "description": "Nice run",
+    }
+
+
+def mock_lap(id=1, name="Lap 1") -> dict:
+    return {
+        "id": id,
+        "activity": {"id": 123},
+        "lap_index": id,
+        "name": name,
+        "elapsed_time": 600,
+        "moving_time": 580,
+        "distance": 1000.0,
+        "average_speed": 2.5,
+        "max_speed": 3.0,
+        "average_cadence": 85.0,
+        "average_watts": None,
+        "average_heartrate": 145.0,
+        "max_heartrate": 165.0,
+        "total_elevation_gain": 50.0,
+    }
+
+
+def mock_stream(data) -> dict:
+    return {"data": data, "series_type": "distance"}
 
 
 @pytest.fixture
 def mock_client():
-    return MagicMock()
+    """
+    Mock StravaClient whose `api` returns raw JSON payloads; `get` runs them
+    through the service's decoder like the real client does.
+    """
+    client = MagicMock()
+    client.api = AsyncMock()
+    client.athlete_id = None
+
+    async def get(*args, decoder=None, conditional=False, **kwargs):
+        payload = await client.api(*args, **kwargs)
+        if decoder is None:
+            return payload
+        return decoder.decode(msgspec.json.encode(payload))
+
+    client.get = AsyncMock(side_effect=get)
+    return client
 
 
 def test_get_athlete_stats(mock_client):
     # Setup mocks
-    mock_client.get_athlete.return_value = MockAthlete()
-    mock_client.get_athlete_stats.return_value = MockStats()
+    mock_client.api.side_effect = [mock_athlete(), mock_stats()]
 
     # Run service function
-    result = get_athlete_stats(mock_client)
+    result = asyncio.run(get_athlete_stats(mock_client))
 
     # Verify - result is now an AthleteStats dataclass
     assert isinstance(result, AthleteStats)
@@ -101,20 +123,77 @@ def test_get_athlete_stats(mock_client):
     assert "Distance: 1000.0" in formatted
     assert "Achievement Count: 5" in formatted
 
-    mock_client.get_athlete.assert_called_once()
-    mock_client.get_athlete_stats.assert_called_once_with(123)
+    assert [c.args[0] for c in mock_client.api.call_args_list] == [
+        "/athlete",
+        "/athletes/123/stats",
+    ]
+    assert mock_client.athlete_id == 123
+
+
+def test_get_athlete_stats_cached_athlete_id(mock_client):
+    # With a known athlete id, both endpoints are requested together
+    mock_client.athlete_id = 123
+
+    async def fake_get(path, params=None):
+        return mock_athlete() if path == "/athlete" else mock_stats()
+
+    mock_client.api.side_effect = fake_get
+
+    result = asyncio.run(get_athlete_stats(mock_client))
+
+    assert result.firstname == "Test"
+    assert result.all_run_totals.distance == 50000.0
+    assert sorted(c.args[0] for c in mock_client.api.call_args_list) == [
+        "/athlete",
+        "/athletes/123/stats",
+    ]
+
+
+def test_get_athlete_stats_is_cached(mock_client):
+    async def fake_get(path, params=None):
+        return mock_athlete() if path == "/athlete" else mock_stats()
+
+    mock_client.api.side_effect = fake_get
+
+    first = asyncio.run(get_athlete_stats(mock_client))
+    second = asyncio.run(get_athlete_stats(mock_client))
+    assert first == second
+    assert mock_client.api.call_count == 2
+
+    # force_refresh bypasses both caches
+    asyncio.run(get_athlete_stats(mock_client, force_refresh=True))
+    assert sorted(c.args[0] for c in mock_client.api.call_args_list[2:]) == [
+        "/athlete",
+        "/athletes/123/stats",
+    ]
+
+
+def test_get_athlete_stats_missing_totals(mock_client):
+    # Totals Strava omits or returns as null default to zero
+    mock_client.api.side_effect = [
+        mock_athlete(),
+        {"recent_run_totals": None, "recent_ride_totals": {"distance": 10.0}},
+    ]
+
+    result = asyncio.run(get_athlete_stats(mock_client))
+
+    assert result.recent_run_totals.distance == 0.0
+    assert result.recent_run_totals.achievement_count == 0
+    assert result.all_run_totals.distance == 0.0
+    assert result.recent_ride_totals.distance == 10.0
+    assert result.recent_ride_totals.elevation_gain == 0.0
 
 
 def test_list_activities(mock_client):
     # Setup mocks
     activities = [
-        MockActivity(id=1, name="Run 1"),
-        MockActivity(id=2, name="Ride 1", type="Ride"),
+        mock_activity(id=1, name="Run 1"),
+        mock_activity(id=2, name="Ride 1", type="Ride"),
     ]
-    mock_client.get_activities.return_value = activities
+    mock_client.api.return_value = activities
 
     # Run service function
-    result = list_activities(mock_client, limit=2)
+    result = asyncio.run(list_activities(mock_client, limit=2))
 
     # Verify - result is now a list of ActivitySummary dataclasses
     assert len(result) == 2
@@ -124,27 +203,63 @@ def test_list_activities(mock_client):
     assert result[0].type == "Run"
     assert result[1].type == "Ride"
     assert result[0].moving_time == 1800
+    assert result[0].start_date == "2023-01-01T12:00:00Z"
 
     # Verify to_dict method works
     dict_result = result[0].to_dict()
     assert dict_result["id"] == 1
     assert dict_result["name"] == "Run 1"
 
-    mock_client.get_activities.assert_called_once_with(limit=2)
+    mock_client.api.assert_called_once_with(
+        "/athlete/activities", params={"per_page": 2, "page": 1}
+    )
+
+
+def test_list_activities_coerces_numbers(mock_client):
+    # Strava sends whole numbers without a decimal point
+    mock_client.api.return_value = [{**mock_activity(), "distance": 5000}]
+    result = asyncio.run(list_activities(mock_client, limit=1))
+
+    assert type(result[0].distance) is float
+    assert result[0].distance == 5000.0
+
+
+def test_list_activities_shares_type_strings(mock_client):
+    mock_client.api.return_value = [mock_activity(id=1), mock_activity(id=2)]
+    first, second = asyncio.run(list_activities(mock_client, limit=2))
+
+    assert first.type == "Run"
+    assert first.type is second.type
 
 
 def test_list_activities_empty(mock_client):
-    mock_client.get_activities.return_value = []
-    result = list_activities(mock_client, limit=5)
+    mock_client.api.return_value = []
+    result = asyncio.run(list_activities(mock_client, limit=5))
     assert result == []
 
 
+def test_list_activities_is_cached_with_stale_fallback(mock_client):
+    mock_client.api.return_value = [mock_activity(id=1)]
+    first = asyncio.run(list_activities(mock_client, limit=5))
+    assert asyncio.run(list_activities(mock_client, limit=5)) == first
+    mock_client.api.assert_called_once()
+
+    # When a refresh fails, the last list is served instead of the error
+    mock_client.api.side_effect = RuntimeError("Strava API request failed")
+    result = asyncio.run(list_activities(mock_client, limit=5, force_refresh=True))
+    assert result == first
+
+    # Without a previous list for these arguments, the error propagates
+    with pytest.raises(RuntimeError):
+        asyncio.run(list_activities(mock_client, limit=10))
+
+
 def test_get_activity_details(mock_client):
     # Setup mocks
-    mock_client.get_activity.return_value = MockActivity(id=999, name="Big Race")
+    mock_client.api.return_value = mock_activity(id=999, name="Big Race")
 
     # Run service function
-    result = get_activity_details(mock_client, 999)
+    result = asyncio.run(get_activity_details(mock_client, 999))
 
     # Verify - result is now an ActivityDetails dataclass
     assert isinstance(result, ActivityDetails)
@@ -158,19 +273,29 @@ def test_get_activity_details(mock_client):
     assert dict_result["id"] == 999
     assert dict_result["name"] == "Big Race"
 
-    mock_client.get_activity.assert_called_once_with(999)
+    mock_client.api.assert_called_once_with("/activities/999")
+
+
+def test_models_are_immutable(mock_client):
+    # Results are shared through the activity cache, so they must not change
+    mock_client.api.return_value = mock_activity(id=999)
+    result = asyncio.run(get_activity_details(mock_client, 999))
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.name = "Renamed"
+    assert not hasattr(result, "__dict__")
 
 
 def test_get_activity_laps(mock_client):
     # Setup mocks
     laps = [
-        MockLap(id=1, name="Lap 1"),
-        MockLap(id=2, name="Lap 2"),
+        mock_lap(id=1, name="Lap 1"),
+        mock_lap(id=2, name="Lap 2"),
     ]
-    mock_client.get_activity_laps.return_value = laps
+    mock_client.api.return_value = laps
 
     # Run service function
-    result = get_activity_laps(mock_client, 123)
+    result = asyncio.run(get_activity_laps(mock_client, 123))
 
     # Verify - result is a list of LapSummary dataclasses
     assert len(result) == 2
@@ -194,36 +319,37 @@ def test_get_activity_laps(mock_client):
     assert dict_result["name"] == "Lap 1"
     assert dict_result["lap_index"] == 1
 
-    mock_client.get_activity_laps.assert_called_once_with(123)
+    mock_client.api.assert_called_once_with("/activities/123/laps")
 
 
 def test_get_activity_laps_empty(mock_client):
-    mock_client.get_activity_laps.return_value = []
-    result = get_activity_laps(mock_client, 123)
+    mock_client.api.return_value = []
+    result = asyncio.run(get_activity_laps(mock_client, 123))
     assert result == []
 
 
 def test_get_activity_streams(mock_client):
     # Setup mocks with sample stream data
     mock_streams = {
-        "time": MockStream([0, 1, 2, 3, 4]),
-        "latlng": MockStream([[37.7, -122.4], [37.8, -122.5]]),
-        "distance": MockStream([0.0, 10.0, 20.0, 30.0, 40.0]),
-        "altitude": MockStream([100.0, 101.0, 102.0, 103.0, 104.0]),
-        "heartrate": MockStream([120, 125, 130, 135, 140]),
+        "time": mock_stream([0, 1, 2, 3, 4]),
+        "latlng": mock_stream([[37.7, -122.4], [37.8, -122.5]]),
+        "distance": mock_stream([0.0, 10.0, 20.0, 30.0, 40.0]),
+        "altitude": mock_stream([100.0, 101.0, 102.0, 103.0, 104.0]),
+        "heartrate": mock_stream([120, 125, 130, 135, 140]),
     }
-    mock_client.get_activity_streams.return_value = mock_streams
+    mock_client.api.return_value = mock_streams
 
     # Run service function with specific types
-    result = get_activity_streams(mock_client, 123, types=["time", "heartrate"])
+    types = ["time", "latlng", "distance", "altitude", "heartrate"]
+    result = asyncio.run(get_activity_streams(mock_client, 123, types=types))
 
     # Verify - result is an ActivityStreams dataclass
     assert isinstance(result, ActivityStreams)
-    assert result.time == [0, 1, 2, 3, 4]
-    assert result.heartrate == [120, 125, 130, 135, 140]
-    assert result.latlng == [[37.7, -122.4], [37.8, -122.5]]
-    assert result.distance == [0.0, 10.0, 20.0, 30.0, 40.0]
-    assert result.altitude == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert result.time == array("i", [0, 1, 2, 3, 4])
+    assert result.heartrate == array("i", [120, 125, 130, 135, 140])
+    assert result.latlng == array("d", [37.7, -122.4, 37.8, -122.5])
+    assert result.distance == array("d", [0.0, 10.0, 20.0, 30.0, 40.0])
+    assert result.altitude == array("d", [100.0, 101.0, 102.0, 103.0, 104.0])
     assert result.cadence is None  # Not in our mock data
     assert result.watts is None  # Not in our mock data
 
@@ -233,15 +359,135 @@ def test_get_activity_streams(mock_client):
     assert "heartrate" in dict_result
     assert "cadence" not in dict_result  # None values should be excluded
     assert dict_result["time"] == [0, 1, 2, 3, 4]
+    assert dict_result["latlng"] == [[37.7, -122.4], [37.8, -122.5]]
+
+    mock_client.api.assert_called_once_with(
+        "/activities/123/streams",
+        params={
+            "keys": "time,latlng,distance,altitude,heartrate",
+            "key_by_type": "true",
+        },
+    )
+
+
+def test_get_activity_streams_prunes_unrequested_types(mock_client):
+    # Strava always adds the series type stream, here distance
+    mock_client.api.return_value = {
+        "heartrate": mock_stream([120, 125]),
+        "distance": mock_stream([0.0, 10.0]),
+    }
+
+    result = asyncio.run(get_activity_streams(mock_client, 123, types=["heartrate"]))
+
+    assert result.heartrate == array("i", [120, 125])
+    assert result.distance is None
 
-    mock_client.get_activity_streams.assert_called_once_with(
-        123, types=["time", "heartrate"], resolution=None
+
+def test_activity_streams_to_dict_shares_stream_lists():
+    heartrate = [120, 125, 130]
+    streams = ActivityStreams(heartrate=heartrate)
+
+    assert streams.to_dict() == {"heartrate": [120, 125, 130]}
+    assert streams.to_dict()["heartrate"] is heartrate
+
+
+def test_pack_stream_round_trip():
+    assert unpack_stream("moving", pack_stream("moving", [True, False])) == [
+        True,
+        False,
+    ]
+    assert unpack_stream("latlng", pack_stream("latlng", [[1.5, 2.5]])) == [[1.5, 2.5]]
+
+    # Samples that don't fit the channel type stay as a plain list
+    watts = [200, None, 210]
+    assert pack_stream("watts", watts) is watts
+    assert unpack_stream("watts", watts) is watts
+
+    # Sensor channels take two bytes per sample, unless a reading overflows
+    assert pack_stream("heartrate", [120, 190]).itemsize == 2
+    assert pack_stream("watts", [200, 40000]) == [200, 40000]
+
+
+def test_activity_streams_nbytes_counts_packed_samples():
+    streams = ActivityStreams(
+        time=pack_stream("time", [0, 1, 2]),
+        latlng=pack_stream("latlng", [[1.0, 2.0], [3.0, 4.0]]),
+    )
+    assert streams.nbytes() == 3 * 4 + 4 * 8
+    assert ActivityStreams(watts=[200, None]).nbytes() > 0
+
+
+def test_activity_streams_to_dict_compact():
+    streams = ActivityStreams(
+        heartrate=pack_stream("heartrate", [120, 255]),
+        latlng=pack_stream("latlng", [[37.7, -122.4]]),
+        velocity_smooth=pack_stream("velocity_smooth", [2.5, 3.14]),
+        altitude=pack_stream("altitude", [100.5]),
+        watts=[200, None],
+    )
+
+    result = streams.to_dict(compact=True)
+
+    assert result["heartrate"]["dtype"] == "<u1"
+    assert base64.b64decode(result["heartrate"]["data"]) == bytes([120, 255])
+    assert result["latlng"]["shape"] == [1, 2]
+    assert struct.unpack("<2i", base64.b64decode(result["latlng"]["data"])) == (
+        377000000,
+        -1224000000,
+    )
+    assert result["velocity_smooth"]["scale"] == 100
+    assert struct.unpack(
+        "<2h", base64.b64decode(result["velocity_smooth"]["data"])
+    ) == (
+        250,
+        314,
+    )
+    assert struct.unpack("<e", base64.b64decode(result["altitude"]["data"])) == (100.5,)
+    # Channels with null samples can't be quantized and stay as lists
+    assert result["watts"] == [200, None]
+
+
+def test_serialize_tool_result():
+    streams = ActivityStreams(time=[0, 1], latlng=[[37.7, -122.4], [37.8, -122.5]])
+
+    assert serialize_tool_result(streams.to_dict()) == (
+        '{"time":[0,1],"latlng":[[37.7,-122.4],[37.8,-122.5]]}'
+    )
+
+
+def test_serialize_tool_result_encodes_dataclasses_like_to_dict(mock_client):
+    mock_client.api.return_value = [mock_activity(id=1), mock_activity(id=2)]
+    activities = asyncio.run(list_activities(mock_client, limit=2))
+
+    assert serialize_tool_result(activities) == serialize_tool_result(
+        [activity.to_dict() for activity in activities]
     )
 
 
+def test_serialize_tool_result_falls_back_for_big_integers():
+    assert serialize_tool_result({"id": 2**70}) == '{"id":1180591620717411303424}'
+
+
+def test_serialize_tool_result_matches_pydantic_for_sets_and_bytes():
+    result = {"ids": {1, 2}, "seen": frozenset({1}), "raw": b"ab"}
+    assert serialize_tool_result(result) == '{"ids":[1,2],"seen":[1],"raw":"ab"}'
+
+
+def test_get_activity_streams_ignores_unknown_types(mock_client):
+    mock_client.api.return_value = {
+        "time": mock_stream([0, 1]),
+        "smoothed_altitude": mock_stream([1.0, 2.0]),
+    }
+
+    result = asyncio.run(get_activity_streams(mock_client, 123))
+
+    assert list(result.time) == [0, 1]
+    assert result.altitude is None
+
+
 def test_get_activity_streams_empty(mock_client):
-    mock_client.get_activity_streams.return_value = {}
-    result = get_activity_streams(mock_client, 123)
+    mock_client.api.return_value = {}
+    result = asyncio.run(get_activity_streams(mock_client, 123))
     assert isinstance(result, ActivityStreams)
     assert result.to_dict() == {}
 
@@ -249,14 +495,14 @@ def test_get_activity_streams_empty(mock_client):
 def test_get_activity_streams_missing_fields(mock_client):
     # Setup mocks with partial stream data
     mock_streams = {
-        "time": MockStream([0, 1, 2]),
+        "time": mock_stream([0, 1, 2]),
     }
-    mock_client.get_activity_streams.return_value = mock_streams
+    mock_client.api.return_value = mock_streams
 
-    result = get_activity_streams(mock_client, 123)
+    result = asyncio.run(get_activity_streams(mock_client, 123))
 
     assert isinstance(result, ActivityStreams)
-    assert result.time == [0, 1, 2]
+    assert list(result.time) == [0, 1, 2]
     assert result.heartrate is None
     assert result.latlng is None
 
@@ -264,34 +510,46 @@ def test_get_activity_streams_missing_fields(mock_client):
 def test_search_activities_by_name(mock_client):
     # Setup mocks
     activities = [
-        MockActivity(id=1, name="Morning Run", type="Run"),
-        MockActivity(id=2, name="Evening Ride", type="Ride"),
-        MockActivity(id=3, name="Morning Walk", type="Walk"),
+        mock_activity(id=1, name="Morning Run", type="Run"),
+        mock_activity(id=2, name="Evening Ride", type="Ride"),
+        mock_activity(id=3, name="Morning Walk", type="Walk"),
     ]
-    mock_client.get_activities.return_value = activities
+    mock_client.api.return_value = activities
 
     # Search for "morning" activities
-    result = search_activities(mock_client, query="morning", limit=10)
+    result = asyncio.run(search_activities(mock_client, query="morning", limit=10))
 
     assert len(result) == 2
     assert all(isinstance(r, ActivitySummary) for r in result)
     assert result[0].name == "Morning Run"
     assert result[1].name == "Morning Walk"
+    assert result[0].average_speed == 2.8
+
+    mock_client.api.assert_called_once()
+
 
-    mock_client.get_activities.assert_called_once()
+def test_search_activities_by_name_casefolds(mock_client):
+    mock_client.api.return_value = [
+        mock_activity(id=1, name="Laufen an der Straße"),
+        mock_activity(id=2, name="Evening Ride", type="Ride"),
+    ]
+
+    result = asyncio.run(search_activities(mock_client, query="STRASSE", limit=10))
+
+    assert [r.id for r in result] == [1]
 
 
 def test_search_activities_by_type(mock_client):
     # Setup mocks
     activities = [
-        MockActivity(id=1, name="Run 1", type="Run"),
-        MockActivity(id=2, name="Ride 1", type="Ride"),
-        MockActivity(id=3, name="Run 2", type="Run"),
+        mock_activity(id=1, name="Run 1", type="Run"),
+        mock_activity(id=2, name="Ride 1", type="Ride"),
+        mock_activity(id=3, name="Run 2", type="Run"),
     ]
-    mock_client.get_activities.return_value = activities
+    mock_client.api.return_value = activities
 
     # Filter by type "run"
-    result = search_activities(mock_client, activity_type="run", limit=10)
+    result = asyncio.run(search_activities(mock_client, activity_type="run", limit=10))
 
     assert len(result) == 2
     assert all(r.type == "Run" for r in result)
@@ -299,19 +557,21 @@ def test_search_activities_by_type(mock_client):
 
 def test_search_activities_by_distance(mock_client):
     # Setup mocks with different distances
-    act1 = MockActivity(id=1, name="Short Run", type="Run")
-    act1.distance = 3000.0
-    act2 = MockActivity(id=2, name="Long Run", type="Run")
-    act2.distance = 10000.0
-    act3 = MockActivity(id=3, name="Medium Run", type="Run")
-    act3.distance = 5000.0
+    act1 = mock_activity(id=1, name="Short Run", type="Run")
+    act1["distance"] = 3000.0
+    act2 = mock_activity(id=2, name="Long Run", type="Run")
+    act2["distance"] = 10000.0
+    act3 = mock_activity(id=3, name="Medium Run", type="Run")
+    act3["distance"] = 5000.0
 
     activities = [act1, act2, act3]
-    mock_client.get_activities.return_value = activities
+    mock_client.api.return_value = activities
 
     # Filter by distance range
-    result = search_activities(
-        mock_client, min_distance=4000.0, max_distance=6000.0, limit=10
+    result = asyncio.run(
+        search_activities(
+            mock_client, min_distance=4000.0, max_distance=6000.0, limit=10
+        )
     )
 
     assert len(result) == 1
@@ -322,32 +582,85 @@ def test_search_activities_by_distance(mock_client):
 def test_search_activities_combined_filters(mock_client):
     # Setup mocks
     activities = [
-        MockActivity(id=1, name="Morning Run", type="Run"),
-        MockActivity(id=2, name="Morning Ride", type="Ride"),
-        MockActivity(id=3, name="Evening Run", type="Run"),
-        MockActivity(id=4, name="Evening Ride", type="Ride"),
+        mock_activity(id=1, name="Morning Run", type="Run"),
+        mock_activity(id=2, name="Morning Ride", type="Ride"),
+        mock_activity(id=3, name="Evening Run", type="Run"),
+        mock_activity(id=4, name="Evening Ride", type="Ride"),
     ]
-    mock_client.get_activities.return_value = activities
+    mock_client.api.return_value = activities
 
     # Combined search: "morning" + "ride"
-    result = search_activities(
-        mock_client, query="morning", activity_type="ride", limit=10
+    result = asyncio.run(
+        search_activities(mock_client, query="morning", activity_type="ride", limit=10)
     )
 
     assert len(result) == 1
     assert result[0].name == "Morning Ride"
 
 
+def test_search_activities_date_filters(mock_client):
+    mock_client.api.return_value = []
+
+    asyncio.run(
+        search_activities(
+            mock_client, after="2025-01-01", before="2026-01-01T00:00:00Z", limit=10
+        )
+    )
+
+    # Dates are sent to Strava as Unix timestamps (naive dates are UTC)
+    mock_client.api.assert_called_once_with(
+        "/athlete/activities",
+        params={
+            "per_page": 200,
+            "after": 1735689600,
+            "before": 1767225600,
+            "page": 1,
+        },
+    )
+
+
+def test_search_activities_pages_until_limit(mock_client):
+    # Full pages of non-matching activities, with one match per page
+    def page_of(n):
+        page = [mock_activity(id=n * 1000 + i, name="Walk") for i in range(199)]
+        return page + [mock_activity(id=n, name=f"Morning Run {n}")]
+
+    async def fake_get(path, params=None):
+        return page_of(params["page"])
+
+    mock_client.api.side_effect = fake_get
+
+    result = asyncio.run(search_activities(mock_client, query="morning", limit=3))
+
+    assert [r.id for r in result] == [1, 2, 3]
+    # Page 1 alone, then pages 2-5 concurrently; no further pages once satisfied
+    pages = sorted(c.kwargs["params"]["page"] for c in mock_client.api.call_args_list)
+    assert pages == [1, 2, 3, 4, 5]
+
+
+def test_search_activities_stops_at_last_page(mock_client):
+    async def fake_get(path, params=None):
+        if params["page"] == 1:
+            return [mock_activity(id=i) for i in range(200)]
+        return [mock_activity(id=999)] if params["page"] == 2 else []
+
+    mock_client.api.side_effect = fake_get
+
+    result = asyncio.run(search_activities(mock_client, limit=500))
+
+    assert len(result) == 201
+
+
 def test_search_activities_no_matches(mock_client):
     # Setup mocks
     activities = [
-        MockActivity(id=1, name="Morning Run", type="Run"),
-        MockActivity(id=2, name="Evening Ride", type="Ride"),
+        mock_activity(id=1, name="Morning Run", type="Run"),
+        mock_activity(id=2, name="Evening Ride", type="Ride"),
     ]
-    mock_client.get_activities.return_value = activities
+    mock_client.api.return_value = activities
 
     # Search for non-existent term
-    result = search_activities(mock_client, query="swimming", limit=10)
+    result = asyncio.run(search_activities(mock_client, query="swimming", limit=10))
 
     assert len(result) == 0
     assert result == []
@@ -356,12 +669,16 @@ def test_search_activities_no_matches(mock_client):
 def test_search_activities_empty_query_returns_all(mock_client):
     # Setup mocks
     activities = [
-        MockActivity(id=1, name="Run 1", type="Run"),
-        MockActivity(id=2, name="Run 2", type="Run"),
+        mock_activity(id=1, name="Run 1", type="Run"),
+        mock_activity(id=2, name="Run 2", type="Run"),
     ]
-    mock_client.get_activities.return_value = activities
+    mock_client.api.return_value = activities
 
     # No filters - should return all
-    result = search_activities(mock_client, limit=10)
+    result = asyncio.run(search_activities(mock_client, limit=10))
 
     assert len(result) == 2
+    # Served by list_activities: a single page of exactly `limit`
+    mock_client.api.assert_called_once_with(
+        "/athlete/activities", params={"per_page": 10, "page": 1}
+    )
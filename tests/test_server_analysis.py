@@ -1,4 +1,6 @@
-from unittest.mock import patch, MagicMock
+import asyncio
+
+from unittest.mock import patch
 from server import analyze_data_tool
 
 
@@ -13,7 +15,7 @@ def test_analyze_data_tool_with_dict():
         mock_analyze.return_value = 1
 
         # Access the underlying function directly
-        result = analyze_data_tool.fn(code, data)
+        result = asyncio.run(analyze_data_tool.fn(code, data))
 
         assert result == 1
         mock_analyze.assert_called_with(code, data)
@@ -27,7 +29,7 @@ def test_analyze_data_tool_with_json_string():
     with patch("server.analyze_data") as mock_analyze:
         mock_analyze.return_value = 1
 
-        result = analyze_data_tool.fn(code, data_str)
+        result = asyncio.run(analyze_data_tool.fn(code, data_str))
 
         assert result == 1
         # Check that it parsed the JSON
@@ -42,6 +44,6 @@ def test_analyze_data_tool_error_handling():
     with patch("server.analyze_data") as mock_analyze:
         mock_analyze.side_effect = RuntimeError("Monty error")
 
-        result = analyze_data_tool.fn(code, data)
+        result = asyncio.run(analyze_data_tool.fn(code, data))
 
         assert "Error executing code: Monty error" in result